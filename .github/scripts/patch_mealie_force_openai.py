@@ -20,16 +20,84 @@ NOT the branch tip - see the workflow's cherry-pick step comment for
 why) has been applied.
 
 Usage: python3 patch_mealie_force_openai.py
+
+Patched files are cached by content: the sha256 of this script plus the
+target's path and pre-image content maps to the stored post-image in
+PATCH_CACHE (default: .cache/mealie-patch at the repo root, persisted by
+actions/cache in mealie-rebuild.yaml). A known pre-image - including an
+already-patched file, whose post-image is recorded as its own mapping -
+is written straight from the cache with no re-matching. An unknown one
+falls back to the anchored replacements below, and the result is
+recorded once it compiles. Editing this script changes every key, so a
+changed patch never reuses stale post-images.
 """
 
+import hashlib
+import os
+
 ABOUT_SCHEMA = "mealie/schema/admin/about.py"
 ABOUT_ROUTE = "mealie/routes/app/app_about.py"
 
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+PATCH_CACHE = os.environ.get("PATCH_CACHE", os.path.join(REPO_ROOT, ".cache", "mealie-patch"))
+
+SCHEMA_FIELD = "\n    enable_openai: bool = False"
+ROUTE_ARG = "        enable_openai=enable_openai,\n"
+ROUTE_LOOKUP = (
+    "\n    enable_openai = False\n"
+    "    if default_group:\n"
+    "        group_repos = get_repositories(session, group_id=default_group.id, household_id=None)\n"
+    "        ai_settings = group_repos.group_ai_provider_settings.get_one(default_group.id)\n"
+    "        enable_openai = bool(ai_settings and ai_settings.ai_enabled)\n"
+)
+
+
+with open(os.path.abspath(__file__), "rb") as _f:
+    SCRIPT_HASH = hashlib.sha256(_f.read()).hexdigest()
+
 
-def patch_app_info_schema():
-    with open(ABOUT_SCHEMA) as f:
+def cache_key(path, content):
+    h = hashlib.sha256()
+    for part in (SCRIPT_HASH, path, content):
+        h.update(part.encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def apply_patch(path, patch):
+    """Run `patch` (pre-image -> post-image) on `path`, via the pre-image cache."""
+    with open(path) as f:
         content = f.read()
 
+    cached = os.path.join(PATCH_CACHE, cache_key(path, content))
+    if os.path.exists(cached):
+        with open(cached) as f:
+            patched = f.read()
+        if patched == content:
+            print(f"{path}: already patched (cache hit), skipping")
+        else:
+            with open(path, "w") as f:
+                f.write(patched)
+            print(f"Patched {path} from cache")
+        return
+
+    patched = patch(content)
+    try:
+        # compile(), not ast.parse(): only the compiler rejects a repeated keyword argument
+        compile(patched, path, "exec")
+    except SyntaxError as e:
+        # never write or cache a broken result
+        raise SystemExit(f"{path}: patched file does not compile ({e}). Manual update needed.")
+    if patched != content:
+        with open(path, "w") as f:
+            f.write(patched)
+    os.makedirs(PATCH_CACHE, exist_ok=True)
+    for key_content in (content, patched):
+        with open(os.path.join(PATCH_CACHE, cache_key(path, key_content)), "w") as f:
+            f.write(patched)
+
+
+def patch_app_info_schema(content):
     marker = "    allowed_iframe_hosts: list[str] = []"
     if marker not in content:
         raise SystemExit(
@@ -37,25 +105,28 @@ def patch_app_info_schema():
             "- AppInfo schema may have changed. Manual update needed."
         )
     if "enable_openai" in content:
-        print(f"{ABOUT_SCHEMA}: enable_openai already present, skipping")
-        return
+        if marker + SCHEMA_FIELD in content:
+            print(f"{ABOUT_SCHEMA}: enable_openai already present, skipping")
+            return content
+        raise SystemExit(
+            f"patch_app_info_schema: {ABOUT_SCHEMA} already mentions enable_openai, but not as this "
+            "script adds it - upstream may have added the field. Manual update needed."
+        )
 
-    content = content.replace(
-        marker,
-        marker + "\n    enable_openai: bool = False",
-    )
-    with open(ABOUT_SCHEMA, "w") as f:
-        f.write(content)
+    content = content.replace(marker, marker + SCHEMA_FIELD)
     print(f"Patched {ABOUT_SCHEMA}: added enable_openai field to AppInfo")
+    return content
 
 
-def patch_about_route():
-    with open(ABOUT_ROUTE) as f:
-        content = f.read()
-
+def patch_about_route(content):
     if "enable_openai" in content:
-        print(f"{ABOUT_ROUTE}: enable_openai already wired, skipping")
-        return
+        if ROUTE_LOOKUP in content and ROUTE_ARG in content:
+            print(f"{ABOUT_ROUTE}: enable_openai already wired, skipping")
+            return content
+        raise SystemExit(
+            f"patch_about_route: {ABOUT_ROUTE} already mentions enable_openai, but not as this "
+            "script wires it - upstream may have added it. Manual update needed."
+        )
 
     # Insert the lookup right after the existing default_household_slug
     # block, reusing the same public_repos/default_group already computed
@@ -73,14 +144,7 @@ def patch_about_route():
             "- route may have changed. Manual update needed."
         )
 
-    lookup = (
-        "\n    enable_openai = False\n"
-        "    if default_group:\n"
-        "        group_repos = get_repositories(session, group_id=default_group.id, household_id=None)\n"
-        "        ai_settings = group_repos.group_ai_provider_settings.get_one(default_group.id)\n"
-        "        enable_openai = bool(ai_settings and ai_settings.ai_enabled)\n"
-    )
-    content = content.replace(anchor, anchor + lookup, 1)
+    content = content.replace(anchor, anchor + ROUTE_LOOKUP, 1)
 
     return_marker = "    return AppInfo(\n"
     if return_marker not in content:
@@ -88,17 +152,11 @@ def patch_about_route():
             f"patch_about_route: 'return AppInfo(' not found in {ABOUT_ROUTE} "
             "- route may have changed. Manual update needed."
         )
-    content = content.replace(
-        return_marker,
-        return_marker + "        enable_openai=enable_openai,\n",
-        1,
-    )
-
-    with open(ABOUT_ROUTE, "w") as f:
-        f.write(content)
+    content = content.replace(return_marker, return_marker + ROUTE_ARG, 1)
     print(f"Patched {ABOUT_ROUTE}: enable_openai now reflects the default group's AI settings")
+    return content
 
 
 if __name__ == "__main__":
-    patch_app_info_schema()
-    patch_about_route()
+    apply_patch(ABOUT_SCHEMA, patch_app_info_schema)
+    apply_patch(ABOUT_ROUTE, patch_about_route)
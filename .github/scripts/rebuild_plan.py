@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Decide whether a scheduled rebuild workflow has anything to build.
+
+Used by the five upstream-tracking workflows (upstream-rebuild.yaml,
+mealie-rebuild.yaml, build-hermes-agent.yaml, build-dev-pod.yaml,
+upstream-rebuild-signal-cli.yaml) as their first real step, run from the
+repo root. Every input a target's image is built from is resolved
+cheaply - `git ls-remote` for the upstream branch/tag and each adopted
+PR branch, a registry/API lookup for digest and release-tag tracking,
+sha256 for the local files that drive the cherry-picks - and compared
+with the state of the last successful build. If nothing moved, the plan
+says so and the workflow skips the upstream checkout, cherry-picks,
+conflict resolvers, patch scripts and the QEMU image build entirely, so
+a no-op scheduled run finishes in seconds.
+
+Usage: python3 rebuild_plan.py <target> [--force] [--remote NAME=URL ...]
+       python3 rebuild_plan.py <target> --record
+
+Targets and the inputs they track are in TARGETS below. The plan is
+printed as JSON and, under Actions, written to $GITHUB_OUTPUT as
+`build=true|false`, `steps=<space-separated>` plus one `<name>=<value>`
+per remote input (e.g. `upstream=sha256:...` for the digest targets).
+
+Where the state comes from depends on the marker:
+
+  - hermes, dev, signal-cli: the .github marker *is* the upstream
+    identity (an image digest or release tag), so it is the state - no
+    cache needed, same comparison those workflows always made.
+  - bedrock, mealie: the marker records `git rev-parse HEAD` *after* the
+    cherry-picks, and a cherry-pick commit carries the time it was made,
+    so it is different on every run and can never match. Their inputs
+    are instead recorded in STATE_DIR (.cache/rebuild-plan, persisted by
+    actions/cache) by `--record` once the build and the marker commit
+    have succeeded, together with the marker value they produced. A
+    missing state file, or a marker edited since it was recorded (the
+    way to ask for a rebuild by hand), means build.
+
+Cherry-picks are stacked - each one applies on top of the previous - so
+any changed input replays the whole chain; the plan's `changed` list
+names what moved, for the run log. `--remote upstream=/tmp/up.git`
+swaps a remote URL for a local (bare) repo when trying this out.
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import os
+import re
+import subprocess
+import urllib.request
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+STATE_DIR = os.environ.get("REBUILD_PLAN_STATE", os.path.join(REPO_ROOT, ".cache", "rebuild-plan"))
+
+# git: name -> (remote URL, ref), mirroring the workflow's checkout.
+# picks: the workflow whose cherry-picked PR branches are tracked as well,
+# read from the workflow itself (see workflow_picks) so the list cannot
+# drift from what is actually picked. The workflow is also hashed as an
+# input, so editing it forces a rebuild.
+TARGETS = {
+    "bedrock": {
+        "marker": ".github/upstream_sha",
+        "git": {
+            "upstream": ("https://github.com/aws-samples/bedrock-access-gateway.git", "HEAD"),
+        },
+        "picks": ".github/workflows/upstream-rebuild.yaml",
+        "files": [
+            ".github/workflows/upstream-rebuild.yaml",
+            ".github/conflict-rules/bedrock-access-gateway.json",
+            ".github/scripts/resolve_conflicts.py",
+        ],
+        "steps": ["checkout", "cherry-pick", "resolve", "build"],
+    },
+    # Only the pinned tag is tracked remotely: the #7618/#7825 commits are
+    # picked by fixed SHA in the workflow, which is hashed below.
+    "mealie": {
+        "marker": ".github/mealie_upstream_sha",
+        "git": {
+            "upstream": ("https://github.com/mealie-recipes/mealie.git", "refs/tags/${UPSTREAM_TAG}"),
+        },
+        "files": [
+            ".github/workflows/mealie-rebuild.yaml",
+            ".github/conflict-rules/mealie.json",
+            ".github/scripts/resolve_conflicts.py",
+            ".github/scripts/patch_mealie_force_openai.py",
+        ],
+        "steps": ["checkout", "cherry-pick", "resolve", "patch", "build"],
+    },
+    "hermes": {
+        "marker": ".github/hermes_upstream_digest",
+        "docker": "nousresearch/hermes-agent",
+        "steps": ["build"],
+    },
+    "dev": {
+        "marker": ".github/dev_upstream_digest",
+        "docker": "codercom/code-server",
+        "steps": ["build"],
+    },
+    "signal-cli": {
+        "marker": ".github/upstream_tag_signal_cli",
+        "release": "AsamK/signal-cli",
+        "steps": ["build"],
+    },
+}
+
+
+def read_marker(path):
+    try:
+        with open(os.path.join(REPO_ROOT, path)) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return ""
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(os.path.join(REPO_ROOT, path), "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            h.update(block)
+    return "sha256:" + h.hexdigest()
+
+
+# `pick <url> <branch> <pr>` lines, and the `git remote add prN <url>` /
+# `git fetch prN <branch>` pairs written out for picks with a known conflict
+PICK_RE = re.compile(r"^\s*pick\s+(\S+)\s+(\S+)\s+(\d+)\s*$", re.M)
+REMOTE_RE = re.compile(r"^\s*git remote add pr(\d+)\s+(\S+)", re.M)
+FETCH_RE = re.compile(r"^\s*git fetch pr(\d+)\s+(\S+)", re.M)
+
+
+def workflow_picks(path):
+    """{"prN": (url, branch)} for every PR branch `path` cherry-picks, in workflow order."""
+    with open(os.path.join(REPO_ROOT, path)) as f:
+        text = f.read()
+    found = [(m.start(), m.group(3), m.group(1), m.group(2)) for m in PICK_RE.finditer(text)]
+    remotes = {m.group(1): (m.start(), m.group(2)) for m in REMOTE_RE.finditer(text)}
+    fetches = {m.group(1): m.group(2) for m in FETCH_RE.finditer(text)}
+    unpaired = sorted(set(remotes) ^ set(fetches))
+    if unpaired:
+        pr = unpaired[0]
+        raise SystemExit(f"{path}: PR #{pr} has a `git remote add pr{pr}` or a `git fetch pr{pr}` but not both - "
+                         "cannot tell which branch to track. Manual check needed.")
+    found += [(pos, pr, url, fetches[pr]) for pr, (pos, url) in remotes.items()]
+    if not found:
+        raise SystemExit(f"{path}: no cherry-picked PR branches found - pick lines changed form? Manual check needed.")
+    return {f"pr{pr}": (url, branch) for _, pr, url, branch in sorted(found)}
+
+
+def ls_remote(url, ref):
+    """Commit `ref` points to on `url` (annotated tags peeled)."""
+    try:
+        out = subprocess.run(["git", "ls-remote", url, ref, ref + "^{}"],
+                             capture_output=True, text=True, check=True, timeout=60).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        detail = str(getattr(e, "stderr", None) or e).strip().rstrip(".")
+        raise SystemExit(f"git ls-remote {url} {ref} failed: {detail}. Manual check needed.")
+    refs = dict(reversed(line.split("\t", 1)) for line in out.splitlines() if "\t" in line)
+    sha = refs.get(ref + "^{}") or refs.get(ref) or next(
+        (sha for name, sha in refs.items() if name.endswith("/" + ref)), None)
+    if not sha:
+        raise SystemExit(f"{ref} not found on {url} - branch deleted or tag renamed? Manual check needed.")
+    return sha
+
+
+def fetch_json(url, headers=None):
+    req = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            return json.load(resp)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"GET {url} failed: {e}. Manual check needed.")
+
+
+def docker_digest(repo):
+    data = fetch_json(f"https://hub.docker.com/v2/repositories/{repo}/tags/latest")
+    for image in data.get("images", []):
+        if image.get("architecture") == "arm64":
+            return image["digest"]
+    raise SystemExit(f"No arm64 image for {repo}:latest on Docker Hub. Manual check needed.")
+
+
+def release_tag(repo):
+    headers = {"Accept": "application/vnd.github+json"}
+    token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return fetch_json(f"https://api.github.com/repos/{repo}/releases/latest", headers)["tag_name"]
+
+
+def resolve_inputs(target, remotes=None):
+    """Current value of every input `target` is built from, keyed by name."""
+    spec = TARGETS[target]
+    remotes = remotes or {}
+    inputs = {}
+    if "docker" in spec:
+        inputs["upstream"] = docker_digest(spec["docker"])
+    if "release" in spec:
+        inputs["upstream"] = release_tag(spec["release"])
+    git = dict(spec.get("git", {}))
+    if "picks" in spec:
+        git.update(workflow_picks(spec["picks"]))
+    git = {name: (remotes.get(name, url), os.path.expandvars(ref)) for name, (url, ref) in git.items()}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(git))) as pool:
+        inputs.update(zip(git, pool.map(lambda item: ls_remote(*item), git.values())))
+    for path in spec.get("files", []):
+        inputs["file:" + path] = file_hash(path)
+    return inputs
+
+
+def state_file(target):
+    return os.path.join(STATE_DIR, f"{target}.json")
+
+
+def load_state(target):
+    """Inputs and marker of the last successful build, or None if unknown."""
+    spec = TARGETS[target]
+    if "git" not in spec:
+        marker = read_marker(spec["marker"])
+        return {"marker": marker, "inputs": {"upstream": marker}} if marker else None
+    try:
+        with open(state_file(target)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def plan(target, inputs, force=False):
+    spec = TARGETS[target]
+    state = load_state(target)
+    marker = read_marker(spec["marker"])
+    if force:
+        changed = ["forced"]
+    elif state is None:
+        changed = ["no recorded build"]
+    elif state.get("marker") != marker:
+        changed = [f"{spec['marker']} changed since the last recorded build"]
+    else:
+        old = state.get("inputs", {})
+        changed = [name for name in inputs if old.get(name) != inputs[name]]
+        changed += [name for name in old if name not in inputs]
+    return {
+        "target": target,
+        "build": bool(changed),
+        "changed": changed,
+        "steps": spec["steps"] if changed else [],
+        "inputs": inputs,
+    }
+
+
+def write_outputs(result):
+    path = os.environ.get("GITHUB_OUTPUT")
+    if not path:
+        return
+    with open(path, "a") as f:
+        f.write(f"build={'true' if result['build'] else 'false'}\n")
+        f.write(f"steps={' '.join(result['steps'])}\n")
+        for name, value in result["inputs"].items():
+            if not name.startswith("file:"):
+                f.write(f"{name}={value}\n")
+
+
+def record(target):
+    """Promote the pending plan's inputs to the target's state, with the marker it produced."""
+    pending = state_file(target) + ".pending"
+    try:
+        with open(pending) as f:
+            inputs = json.load(f)
+    except (OSError, ValueError):
+        raise SystemExit(f"No pending plan for {target} in {STATE_DIR} - run the plan step first.")
+    state = {"marker": read_marker(TARGETS[target]["marker"]), "inputs": inputs}
+    tmp = state_file(target) + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, state_file(target))
+    os.unlink(pending)
+    print(f"Recorded {target} build inputs ({len(inputs)}) for marker {state['marker']}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Plan (or record) an upstream-tracking image rebuild.")
+    ap.add_argument("target", choices=sorted(TARGETS))
+    ap.add_argument("--force", action="store_true", help="build even if nothing changed")
+    ap.add_argument("--record", action="store_true", help="record the pending plan after a successful build")
+    ap.add_argument("--remote", action="append", default=[], metavar="NAME=URL",
+                    help="override a git input's remote URL, e.g. upstream=/tmp/upstream.git")
+    args = ap.parse_args()
+
+    if args.record:
+        if "git" in TARGETS[args.target]:
+            record(args.target)
+        return
+
+    remotes = dict(item.split("=", 1) for item in args.remote)
+    result = plan(args.target, resolve_inputs(args.target, remotes), args.force)
+    if result["build"] and "git" in TARGETS[args.target]:
+        os.makedirs(STATE_DIR, exist_ok=True)
+        with open(state_file(args.target) + ".pending", "w") as f:
+            json.dump(result["inputs"], f)
+    print(json.dumps(result, indent=2))
+    write_outputs(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Resolve known, expected cherry-pick conflicts from data-file rules.
+
+Used by .github/workflows/upstream-rebuild.yaml and mealie-rebuild.yaml.
+Run from inside the `upstream` checkout, after `git cherry-pick` has
+stopped on a conflict. Each file under .github/conflict-rules/ describes
+the conflicts one upstream is known to produce when our adopted PRs are
+cherry-picked onto it, so adopting another conflicting PR means adding a
+rule there, not writing another script.
+
+Usage: python3 resolve_conflicts.py <rules.json> [--pr 239] [--jobs N]
+
+Every conflicted file is read once and split into a list of hunks
+(ours / base / theirs plus the `>>>>>>>` label); all of that file's rules
+are tried against each hunk in a single pass, and the files are
+processed in parallel. A rule is a JSON object:
+
+    file        path of the conflicted file, relative to the checkout
+    pr          upstream PR the rule belongs to (selected with --pr)
+    label       substring the `>>>>>>> <sha> (<subject>)` label must contain
+    ours        exact text of the HEAD side ...
+    ours_re     ... or a regex it must fully match (named groups usable below)
+    theirs      exact text of the cherry-picked side ...
+    theirs_re   ... or a regex, likewise
+    resolution  replacement for the whole hunk, a string.Template:
+                $ours, $theirs and any named group from the regexes
+    hint        what probably changed upstream if the rule stops matching
+
+Any multi-line value may be given as a list of lines. Sides and the
+resolution are compared/rendered without their final newline. A side
+that is left out matches anything.
+
+Like the per-PR scripts this replaces, it fails loudly rather than
+silently doing nothing: a selected rule that matches no hunk, a hunk no
+rule matches, a conflicted file with no rules, or markers left after
+resolution all raise SystemExit, and a file is only rewritten once every
+one of its hunks is resolved.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import re
+import string
+import subprocess
+
+
+class Hunk:
+    """One `<<<<<<< ... >>>>>>>` conflict region."""
+
+    def __init__(self, line, ours_label):
+        self.line = line            # 1-based line of the <<<<<<< marker
+        self.ours_label = ours_label
+        self.label = ""             # text after >>>>>>>, e.g. "b9e120bc (feat: ...)"
+        self.ours, self.base, self.theirs = [], [], []
+
+
+def _text(value):
+    return "\n".join(value) if isinstance(value, list) else value
+
+
+def parse_hunks(content, path="-"):
+    """Split `content` into plain-text strings and Hunk records, in file order."""
+    parts, plain = [], []
+    hunk = section = None
+    for lineno, line in enumerate(content.splitlines(keepends=True), 1):
+        bare = line.rstrip("\r\n")
+        if hunk is None:
+            if bare.startswith("<<<<<<<"):
+                if plain:
+                    parts.append("".join(plain))
+                    plain = []
+                hunk = Hunk(lineno, bare[8:])
+                section = hunk.ours
+            else:
+                plain.append(line)
+        elif bare.startswith("|||||||") and section is hunk.ours:
+            section = hunk.base
+        elif bare == "=======" and section is not hunk.theirs:
+            section = hunk.theirs
+        elif bare.startswith(">>>>>>>") and section is hunk.theirs:
+            hunk.label = bare[8:]
+            for side in ("ours", "base", "theirs"):
+                setattr(hunk, side, "".join(getattr(hunk, side)).removesuffix("\n"))
+            parts.append(hunk)
+            hunk = None
+        else:
+            section.append(line)
+    if hunk is not None:
+        raise SystemExit(f"{path}:{hunk.line}: conflict hunk is never closed with >>>>>>> - manual rebase needed.")
+    if plain:
+        parts.append("".join(plain))
+    return parts
+
+
+class Rule:
+    def __init__(self, spec):
+        self.file = spec["file"]
+        self.pr = str(spec.get("pr", ""))
+        self.label = spec.get("label")
+        self.hint = spec.get("hint", "upstream code may have changed near this conflict")
+        self.sides = [("ours", self._matcher(spec, "ours")), ("theirs", self._matcher(spec, "theirs"))]
+        self.resolution = string.Template(_text(spec["resolution"]))
+
+    @staticmethod
+    def _matcher(spec, side):
+        if side in spec:
+            literal = _text(spec[side])
+            return lambda text: {} if text == literal else None
+        if side + "_re" in spec:
+            regex = re.compile(_text(spec[side + "_re"]), re.DOTALL)
+            return lambda text: m.groupdict() if (m := regex.fullmatch(text)) else None
+        return lambda text: {}
+
+    def name(self):
+        return f"PR #{self.pr}" if self.pr else "rule"
+
+    def apply(self, hunk):
+        """Resolved text for `hunk`, or None if this rule does not describe it."""
+        if self.label is not None and self.label not in hunk.label:
+            return None
+        groups = {"ours": hunk.ours, "theirs": hunk.theirs}
+        for side, match in self.sides:
+            found = match(getattr(hunk, side))
+            if found is None:
+                return None
+            groups.update({k: v for k, v in found.items() if v is not None})
+        text = self.resolution.substitute(groups)
+        return text + "\n" if text else ""
+
+
+def load_rules(path, pr=None):
+    with open(path) as f:
+        rules = [Rule(spec) for spec in json.load(f)]
+    return [r for r in rules if pr is None or r.pr == pr]
+
+
+def resolve_file(path, rules):
+    """Resolve every hunk in `path` with `rules`; returns a list of error strings."""
+    try:
+        with open(path) as f:
+            parts = parse_hunks(f.read(), path)
+    except OSError as e:
+        return [f"{path}: {e.strerror}"]
+    out, used, errors = [], set(), []
+    for part in parts:
+        if isinstance(part, str):
+            out.append(part)
+            continue
+        for i, rule in enumerate(rules):
+            resolved = rule.apply(part)
+            if resolved is not None:
+                out.append(resolved)
+                used.add(i)
+                break
+        else:
+            errors.append(f"{path}:{part.line}: no rule matches this conflict hunk ({part.label or 'no label'})")
+    for i, rule in enumerate(rules):
+        if i not in used:
+            errors.append(f"{rule.name()}: expected conflict not found in {path} - {rule.hint}.")
+    if errors:
+        return errors
+
+    content = "".join(out)
+    # Only check the actual git conflict markers (<<<<<<< / >>>>>>>), not a
+    # bare "=======" - that 7-char run is common in code/docstrings as a
+    # plain divider and produces false positives here.
+    if "<<<<<<<" in content or ">>>>>>>" in content:
+        return [f"conflict markers remain in {path} after resolution"]
+    with open(path, "w") as f:
+        f.write(content)
+    print(f"Resolved {len(used)} conflict rule(s) in {path}: {', '.join(rules[i].name() for i in sorted(used))}")
+    return []
+
+
+def conflicted_files():
+    """Unmerged paths according to git, or None outside a git checkout."""
+    try:
+        out = subprocess.run(["git", "diff", "--name-only", "--diff-filter=U"],
+                             capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return [line for line in out.splitlines() if line]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Resolve known cherry-pick conflicts from a rules file.")
+    ap.add_argument("rules", help="JSON rules file, e.g. ../.github/conflict-rules/bedrock-access-gateway.json")
+    ap.add_argument("--pr", help="only apply the rules for this upstream PR")
+    ap.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="files resolved in parallel")
+    args = ap.parse_args()
+
+    rules = load_rules(args.rules, args.pr)
+    if not rules:
+        raise SystemExit(f"No rules{' for PR #' + args.pr if args.pr else ''} in {args.rules}")
+    by_file = {}
+    for rule in rules:
+        by_file.setdefault(rule.file, []).append(rule)
+
+    errors = []
+    unmerged = conflicted_files()
+    if unmerged is not None:
+        errors += [f"{path}: conflicted, but no rule covers it - manual rebase needed." for path in unmerged if path not in by_file]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        for file_errors in pool.map(lambda item: resolve_file(*item), by_file.items()):
+            errors += file_errors
+    if errors:
+        raise SystemExit("\n".join(errors) + "\nManual rebase needed.")
+
+
+if __name__ == "__main__":
+    main()
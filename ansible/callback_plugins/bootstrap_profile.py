@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""Time the cold-start bootstrap per stage and per task.
+
+A stage is the task file a task came from (tasks/rook_ceph_deploy_part1.yml
+-> rook_ceph_deploy_part1) or, for role tasks, the role. At the end of the
+run the plugin prints a flame-style per-stage summary, the critical path
+and the time spent in `until:` retry loops, and appends the run to a JSON
+history so cold-start durations can be compared between runs.
+"""
+
+DOCUMENTATION = r"""
+name: bootstrap_profile
+type: aggregate
+short_description: Per-stage timings, critical path and until-loop time for the cold-start bootstrap
+description:
+  - Records the start, end, host, retry count and changed status of every task, grouped by stage (task file or role).
+  - Prints a flame-style per-stage summary, the critical path (the host that finished each task last, which is what
+    the linear strategy waits for) and the time spent in C(until) retry loops.
+  - Writes every run to I(history_dir)/run-<timestamp>.json, appends its totals to I(history_dir)/history.jsonl,
+    and compares the run against the previous one of the same playbook.
+requirements:
+  - enable in ansible.cfg (C(callbacks_enabled = bootstrap_profile))
+options:
+  history_dir:
+    description: Where run files and history.jsonl are kept.
+    default: .cache/bootstrap-profile
+    type: path
+    env: [{name: BOOTSTRAP_PROFILE_DIR}]
+    ini: [{section: callback_bootstrap_profile, key: history_dir}]
+  top:
+    description: Critical-path tasks to list.
+    default: 15
+    type: int
+    env: [{name: BOOTSTRAP_PROFILE_TOP}]
+    ini: [{section: callback_bootstrap_profile, key: top}]
+  min_share:
+    description: Tasks below this share of their stage (percent) are folded into one line in the stage summary.
+    default: 2.0
+    type: float
+    env: [{name: BOOTSTRAP_PROFILE_MIN_SHARE}]
+    ini: [{section: callback_bootstrap_profile, key: min_share}]
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+from ansible.plugins.callback import CallbackBase
+
+BAR = 40
+
+
+def stage_of(task):
+    """Stage name for a task: its role, else the task file it was defined in."""
+    role = getattr(task, "_role", None)
+    if role is not None:
+        return "role:" + role.get_name()
+    path = (task.get_path() or "").rsplit(":", 1)[0]
+    return os.path.splitext(os.path.basename(path))[0] or "playbook"
+
+
+def bar(seconds, total):
+    return "#" * max(1, round(BAR * seconds / total)) if total and seconds else ""
+
+
+def fmt(seconds):
+    if seconds >= 60:
+        return f"{int(seconds // 60)}m{seconds % 60:04.1f}s"
+    return f"{seconds:.1f}s"
+
+
+def summarize(tasks):
+    """Per-task critical entries, stage totals and retry totals from the task records."""
+    critical, stages, retry = [], {}, {"tasks": 0, "retries": 0, "loop": 0.0, "waiting": 0.0}
+    for t in tasks:
+        hosts = [h for h in t["hosts"].values() if h.get("end") is not None]
+        if not hosts:
+            continue
+        # the linear strategy starts the next task only when the slowest host is done
+        wall = max(h["end"] for h in hosts) - min(h["start"] for h in hosts)
+        # the gate is the host that finished last; slack is how long after the next host it did
+        # (end to end, so hosts started one after another by throttle/serial don't inflate it)
+        gate = max(hosts, key=lambda h: h["end"])
+        others = sorted((h["end"] for h in hosts if h is not gate), reverse=True)
+        entry = {"stage": t["stage"], "play": t["play"], "task": t["name"], "host": gate["host"], "seconds": round(wall, 3),
+                 "slack": round(gate["end"] - others[0], 3) if others else None, "retries": gate["retries"],
+                 "changed": any(h["changed"] for h in hosts), "status": gate["status"]}
+        critical.append(entry)
+        s = stages.setdefault(t["stage"], {"seconds": 0.0, "tasks": 0, "changed": 0, "retries": 0, "loop": 0.0})
+        s["seconds"] += wall
+        s["tasks"] += 1
+        s["changed"] += entry["changed"]
+        for h in hosts:
+            if h["retries"]:
+                retry["tasks"] += 1
+                retry["retries"] += h["retries"]
+                retry["loop"] += h["end"] - h["start"]
+                # until the last failed attempt came back, the host was only waiting on the condition
+                retry["waiting"] += h["last_retry"] - h["start"]
+                s["retries"] += h["retries"]
+                s["loop"] += h["end"] - h["start"]
+    return critical, stages, retry
+
+
+class CallbackModule(CallbackBase):
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = "aggregate"
+    CALLBACK_NAME = "bootstrap_profile"
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self):
+        super().__init__()
+        self.started = time.time()
+        self.playbook = None
+        self.play = None
+        self.tasks = []          # in execution order
+        self.by_uuid = {}
+
+    # -- recording ----------------------------------------------------------
+
+    def v2_playbook_on_start(self, playbook):
+        self.playbook = os.path.basename(playbook._file_name)
+
+    def v2_playbook_on_play_start(self, play):
+        self.play = play.get_name().strip()
+
+    def _task(self, task):
+        rec = self.by_uuid.get(task._uuid)
+        if rec is None:
+            rec = {"name": task.get_name().strip(), "stage": stage_of(task), "play": self.play,
+                   "action": task.action, "start": time.time(), "hosts": {}}
+            self.by_uuid[task._uuid] = rec
+            self.tasks.append(rec)
+        return rec
+
+    def v2_playbook_on_task_start(self, task, is_conditional):
+        self._task(task)
+
+    def v2_playbook_on_handler_task_start(self, task):
+        self._task(task)
+
+    def _host(self, task, host):
+        rec = self._task(task)
+        name = host.get_name()
+        if name not in rec["hosts"]:
+            rec["hosts"][name] = {"host": name, "start": time.time(), "end": None, "retries": 0,
+                                  "last_retry": None, "changed": False, "status": None}
+        return rec["hosts"][name]
+
+    def v2_runner_on_start(self, host, task):
+        self._host(task, host)
+
+    def v2_runner_retry(self, result):
+        h = self._host(result._task, result._host)
+        h["retries"] += 1
+        h["last_retry"] = time.time()
+
+    def _done(self, result, status):
+        h = self._host(result._task, result._host)
+        h["end"] = time.time()
+        h["status"] = status
+        h["changed"] = bool(result._result.get("changed", False))
+        attempts = result._result.get("attempts")
+        if attempts and attempts - 1 > h["retries"]:   # retries seen before this plugin was loaded
+            h["retries"] = attempts - 1
+        if h["retries"] and h["last_retry"] is None:
+            h["last_retry"] = h["start"]
+
+    def v2_runner_on_ok(self, result):
+        self._done(result, "ok")
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._done(result, "ignored" if ignore_errors else "failed")
+
+    def v2_runner_on_skipped(self, result):
+        self._done(result, "skipped")
+
+    def v2_runner_on_unreachable(self, result):
+        self._done(result, "unreachable")
+
+    # -- reporting ----------------------------------------------------------
+
+    def v2_playbook_on_stats(self, stats):
+        total = time.time() - self.started
+        critical, stages, retry = summarize(self.tasks)
+        self._report(total, critical, stages, retry)
+        try:
+            previous = self._save(total, critical, stages, retry)
+        except OSError as e:
+            self._display.warning(f"bootstrap_profile: could not write history: {e}")
+            return
+        if previous:
+            self._compare(total, stages, previous)
+
+    def _report(self, total, critical, stages, retry):
+        out = self._display.display
+        min_share = float(self.get_option("min_share"))
+        out(f"\nBOOTSTRAP PROFILE  {self.playbook or ''}  total {fmt(total)}", color="bright blue")
+        out("-" * 78)
+        for name, s in sorted(stages.items(), key=lambda kv: kv[1]["seconds"], reverse=True):
+            out(f"{name:<34} {fmt(s['seconds']):>9} {bar(s['seconds'], total)}")
+            folded, count = 0.0, 0
+            for c in sorted((c for c in critical if c["stage"] == name), key=lambda c: c["seconds"], reverse=True):
+                if s["seconds"] and c["seconds"] / s["seconds"] * 100 < min_share:
+                    folded += c["seconds"]
+                    count += 1
+                    continue
+                tags = "".join([f" [{c['retries']} retries]" if c["retries"] else "", " *" if c["changed"] else ""])
+                out(f"  {c['task'][:32]:<32} {fmt(c['seconds']):>9} {bar(c['seconds'], total)}{tags}")
+            if count:
+                out(f"  {f'({count} shorter tasks)':<32} {fmt(folded):>9}")
+        out("")
+        out(f"CRITICAL PATH  {fmt(sum(c['seconds'] for c in critical))} over {len(critical)} tasks "
+            f"(the last host to finish each task; slack = how long after the next host it finished)", color="bright blue")
+        out(f"{'task':<40} {'stage':<24} {'host':<12} {'time':>8} {'slack':>7}")
+        for c in sorted(critical, key=lambda c: c["seconds"], reverse=True)[:int(self.get_option("top"))]:
+            slack = fmt(c["slack"]) if c["slack"] is not None else "-"
+            out(f"{c['task'][:40]:<40} {c['stage'][:24]:<24} {c['host'][:12]:<12} {fmt(c['seconds']):>8} {slack:>7}")
+        out("")
+        out(f"UNTIL LOOPS  {retry['tasks']} host-tasks retried {retry['retries']} times: {fmt(retry['loop'])} in loops, "
+            f"{fmt(retry['waiting'])} of it before the final attempt", color="bright blue")
+        for name, s in sorted(stages.items(), key=lambda kv: kv[1]["loop"], reverse=True):
+            if s["retries"]:
+                out(f"  {name:<34} {fmt(s['loop']):>9}  {s['retries']} retries")
+
+    def _save(self, total, critical, stages, retry):
+        """Write this run and append it to history.jsonl; returns the previous run of the same playbook."""
+        root = self.get_option("history_dir")
+        os.makedirs(root, exist_ok=True)
+        stamp = datetime.fromtimestamp(self.started, timezone.utc)
+        run = {"playbook": self.playbook, "started": stamp.isoformat(timespec="seconds"), "seconds": round(total, 3),
+               "stages": {k: {**v, "seconds": round(v["seconds"], 3), "loop": round(v["loop"], 3)} for k, v in stages.items()},
+               "until": {k: round(v, 3) if isinstance(v, float) else v for k, v in retry.items()}}
+        previous = None
+        history = os.path.join(root, "history.jsonl")
+        if os.path.exists(history):
+            with open(history) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if entry.get("playbook") == self.playbook:
+                        previous = entry
+        with open(os.path.join(root, f"run-{stamp:%Y%m%dT%H%M%SZ}.json"), "w") as f:
+            json.dump(dict(run, critical=critical, tasks=self.tasks), f, indent=1)
+        with open(history, "a") as f:
+            f.write(json.dumps(run, sort_keys=True) + "\n")
+        return previous
+
+    def _compare(self, total, stages, previous):
+        out = self._display.display
+        delta = total - previous["seconds"]
+        out(f"\nVS PREVIOUS RUN ({previous['started']})  {fmt(previous['seconds'])} -> {fmt(total)} "
+            f"({'+' if delta >= 0 else '-'}{fmt(abs(delta))})", color="bright blue")
+        before = previous.get("stages", {})
+        rows = []
+        for name in set(stages) | set(before):
+            now = stages.get(name, {}).get("seconds", 0.0)
+            was = before.get(name, {}).get("seconds", 0.0)
+            rows.append((now - was, name, was, now))
+        for d, name, was, now in sorted(rows, key=lambda r: abs(r[0]), reverse=True)[:10]:
+            if abs(d) >= 1:
+                out(f"  {name:<34} {fmt(was):>9} -> {fmt(now):>9} ({'+' if d >= 0 else '-'}{fmt(abs(d))})")
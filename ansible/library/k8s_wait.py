@@ -0,0 +1,420 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Wait for several Kubernetes/shell readiness conditions at once.
+
+Replaces the `until:` / `retries:` / `delay:` loops in the bootstrap task
+files: every condition is waited on concurrently and the task returns as
+soon as all of them hold, instead of each step sleeping out a fixed delay
+after its condition is already true.
+"""
+
+DOCUMENTATION = r"""
+module: k8s_wait
+short_description: Wait until a set of Kubernetes resource and command conditions all hold
+description:
+  - Each condition runs in its own thread. The task returns as soon as every condition holds, or fails at I(timeout)
+    listing the ones that did not.
+  - Resource conditions LIST the matching objects and then WATCH them from that resourceVersion, so a change is seen
+    the moment the API server sends it. If the watch cannot be used (it errors, or the server keeps closing it), the
+    condition falls back to polling.
+  - Polling (commands, resources that cannot be watched, and kinds whose CRD is not installed yet) is adaptive and
+    exponential. The delay starts at I(poll_initial) and doubles up to I(poll_max) while nothing changes, and resets
+    whenever the observed state or command output changes.
+  - Talks to the API server directly from the kubeconfig (token or client certificate auth); needs PyYAML, as the
+    kubernetes.core modules used alongside it do. Exec credential plugins are not supported.
+options:
+  conditions:
+    description: Conditions that must all hold. Each one is either a resource condition (I(kind)) or a I(command).
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      kind: {description: Resource kind, e.g. Pod or CustomResourceDefinition., type: str}
+      api_version: {description: Group/version of I(kind)., type: str, default: v1}
+      namespace: {description: Namespace; all namespaces when omitted for a namespaced kind., type: str}
+      name: {description: Only the object with this name., type: str}
+      label_selector: {description: Label selector, e.g. C(app=rook-ceph-mgr)., type: str}
+      field_selector: {description: "Field selector, e.g. C(spec.nodeName=worker1); combined with I(name) when both are set.", type: str}
+      condition: {description: "status.conditions type that must have I(status), e.g. Ready, Established, Available.", type: str}
+      status: {description: Required status of I(condition)., type: str, default: "True"}
+      field: {description: Dotted path into the object, e.g. C(status.phase) or C(status.health.status)., type: str}
+      value: {description: "Required value of I(field), compared as a string; without it I(field) only has to be set and non-empty.", type: str}
+      min_count: {description: At least this many objects must match., type: int, default: 1}
+      all: {description: Every matching object must satisfy I(condition)/I(field), not just I(min_count) of them., type: bool, default: true}
+      command: {description: Shell command that holds when it exits 0 (run with the task's environment)., type: str}
+      description: {description: Label used in the results and failure message., type: str}
+  timeout: {description: Seconds to wait for all conditions., type: int, default: 600}
+  kubeconfig: {description: "Kubeconfig path; defaults to $K8S_AUTH_KUBECONFIG, $KUBECONFIG, then ~/.kube/config.", type: path}
+  context: {description: Kubeconfig context; the current-context when omitted., type: str}
+  watch: {description: Use watches for resource conditions; C(false) polls everything., type: bool, default: true}
+  poll_initial: {description: First polling delay in seconds., type: float, default: 1}
+  poll_max: {description: Longest polling delay in seconds., type: float, default: 15}
+"""
+
+EXAMPLES = r"""
+- name: Wait for the Ceph mgr, the toolbox and HEALTH_OK/WARN together
+  k8s_wait:
+    kubeconfig: "{{ KUBECONFIG }}"
+    timeout: 1800
+    conditions:
+      - {kind: Pod, namespace: rook-ceph, label_selector: app=rook-ceph-mgr, condition: Ready}
+      - {kind: Pod, namespace: rook-ceph, label_selector: app=rook-ceph-tools, condition: Ready}
+      - description: ceph health OK or WARN
+        command: kubectl -n rook-ceph exec deploy/rook-ceph-tools -- sh -c 'ceph health | grep -Eq "HEALTH_OK|HEALTH_WARN"'
+
+- name: Wait for CRDs to be Established
+  k8s_wait:
+    conditions: "{{ crds | map('community.general.dict_kv', 'name')
+                  | map('combine', {'kind': 'CustomResourceDefinition', 'api_version': 'apiextensions.k8s.io/v1', 'condition': 'Established'}) }}"
+"""
+
+RETURN = r"""
+elapsed: {description: Seconds until every condition held (or the timeout)., type: float, returned: always}
+conditions:
+  description: One entry per condition, in task order.
+  type: list
+  returned: always
+  contains:
+    description: {description: The condition's label., type: str}
+    met: {description: Whether it held., type: bool}
+    elapsed: {description: Seconds until it held., type: float}
+    mode: {description: "How it was observed last: watch, poll or command.", type: str}
+    detail: {description: Last observed state, e.g. "1/2 objects Ready"., type: str}
+"""
+
+import base64
+import json
+import os
+import ssl
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
+
+
+class Backoff:
+    """Exponential polling delay that resets whenever progress is seen."""
+
+    def __init__(self, initial, maximum, factor=2.0):
+        self.initial, self.maximum, self.factor = initial, maximum, factor
+        self.delay = initial
+
+    def next(self, progressed):
+        if progressed:
+            self.delay = self.initial
+        else:
+            self.delay = min(self.delay * self.factor, self.maximum)
+        return self.delay
+
+
+class KubeAPI:
+    """Minimal API server client built from a kubeconfig: GET, streamed watch, discovery."""
+
+    def __init__(self, path, context=None, tmpdir=None):
+        with open(path) as f:
+            cfg = yaml.safe_load(f) or {}
+        name = context or cfg.get("current-context")
+        ctx = _named(cfg.get("contexts"), name, "context")
+        cluster = _named(cfg.get("clusters"), ctx["cluster"], "cluster")
+        user = _named(cfg.get("users"), ctx.get("user"), "user") if ctx.get("user") else {}
+        if "exec" in user or "auth-provider" in user:
+            raise ValueError(f"user {ctx.get('user')!r} uses an exec/auth-provider plugin, which k8s_wait does not support")
+        self.server = cluster["server"].rstrip("/")
+        self.headers = {"Accept": "application/json"}
+        token = user.get("token")
+        if not token and user.get("tokenFile"):
+            with open(user["tokenFile"]) as f:
+                token = f.read().strip()
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+        self.context = None
+        if self.server.startswith("https"):
+            self.context = ssl.create_default_context()
+            ca = _material(cluster, "certificate-authority", tmpdir)
+            if cluster.get("insecure-skip-tls-verify"):
+                self.context.check_hostname = False
+                self.context.verify_mode = ssl.CERT_NONE
+            elif ca:
+                self.context.load_verify_locations(cafile=ca)
+            cert = _material(user, "client-certificate", tmpdir)
+            if cert:
+                self.context.load_cert_chain(cert, _material(user, "client-key", tmpdir))
+        self._resources = {}
+        self._lock = threading.Lock()
+
+    def _open(self, path, params=None, timeout=30):
+        url = self.server + path + ("?" + urllib.parse.urlencode(params) if params else "")
+        req = urllib.request.Request(url, headers=self.headers)
+        return urllib.request.urlopen(req, timeout=timeout, context=self.context)
+
+    def get(self, path, params=None):
+        with self._open(path, params) as resp:
+            return json.load(resp)
+
+    def watch(self, path, params, resource_version, seconds):
+        """Yield watch events until the server ends the stream (after ~`seconds`)."""
+        params = dict(params, watch="1", allowWatchBookmarks="true",
+                      resourceVersion=resource_version, timeoutSeconds=str(max(1, int(seconds))))
+        with self._open(path, params, timeout=seconds + 30) as resp:
+            for line in resp:
+                if line.strip():
+                    yield json.loads(line)
+
+    def resource(self, api_version, kind):
+        """(plural, namespaced) for a kind, from API discovery (cached)."""
+        key = (api_version, kind)
+        with self._lock:
+            if key in self._resources:
+                return self._resources[key]
+        base = "/api/v1" if api_version == "v1" else f"/apis/{api_version}"
+        for r in self.get(base).get("resources", []):
+            if r.get("kind") == kind and "/" not in r["name"]:
+                with self._lock:
+                    self._resources[key] = (r["name"], r.get("namespaced", False))
+                return self._resources[key]
+        raise LookupError(f"{kind} is not served by {api_version} (yet)")
+
+
+def _named(items, name, what):
+    for item in items or []:
+        if item.get("name") == name:
+            return item.get(what) or {}
+    raise ValueError(f"kubeconfig has no {what} named {name!r}")
+
+
+def _material(section, key, tmpdir):
+    """Path to a cert/key given inline (`<key>-data`) or as a file (`<key>`)."""
+    data = section.get(key + "-data")
+    if data:
+        fd, path = tempfile.mkstemp(dir=tmpdir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(base64.b64decode(data))
+        return path
+    return section.get(key)
+
+
+def dig(obj, path):
+    for part in path.split("."):
+        if not isinstance(obj, dict):
+            return None
+        obj = obj.get(part)
+    return obj
+
+
+def describe(cond):
+    if cond.get("description"):
+        return cond["description"]
+    if cond.get("command"):
+        return cond["command"]
+    where = "/".join(x for x in (cond.get("namespace"), cond.get("name") or cond.get("label_selector")) if x)
+    want = cond.get("condition") or cond.get("field") or "exists"
+    if not cond.get("condition") and cond.get("field") and cond.get("value") is not None:
+        want += f"={cond['value']}"
+    return f"{cond['kind']} {where} {want}".replace("  ", " ")
+
+
+def object_ok(cond, obj):
+    if cond.get("condition"):
+        for c in dig(obj, "status.conditions") or []:
+            if c.get("type") == cond["condition"]:
+                return str(c.get("status")) == cond["status"]
+        return False
+    if cond.get("field"):
+        found = dig(obj, cond["field"])
+        return bool(found) if cond.get("value") is None else str(found) == cond["value"]
+    return True
+
+
+def evaluate(cond, objects):
+    """(met, detail) for a resource condition over the current set of objects."""
+    objects = list(objects)
+    ok = sum(1 for o in objects if object_ok(cond, o))
+    if cond["all"]:
+        met = len(objects) >= cond["min_count"] and ok == len(objects)
+    else:
+        met = ok >= cond["min_count"]
+    label = cond.get("condition") or cond.get("field") or "present"
+    return met, f"{ok}/{len(objects)} objects {label} (need {'all, ' if cond['all'] else ''}>= {cond['min_count']})"
+
+
+def collection(api, cond):
+    plural, namespaced = api.resource(cond["api_version"], cond["kind"])
+    prefix = "/api/v1" if cond["api_version"] == "v1" else f"/apis/{cond['api_version']}"
+    path = f"{prefix}/namespaces/{cond['namespace']}/{plural}" if namespaced and cond.get("namespace") else f"{prefix}/{plural}"
+    params = {}
+    if cond.get("label_selector"):
+        params["labelSelector"] = cond["label_selector"]
+    selectors = [s for s in (cond.get("field_selector"), f"metadata.name={cond['name']}" if cond.get("name") else None) if s]
+    if selectors:
+        params["fieldSelector"] = ",".join(selectors)
+    return path, params
+
+
+def _key(obj):
+    meta = obj.get("metadata", {})
+    return meta.get("uid") or (meta.get("namespace"), meta.get("name"))
+
+
+def wait_resource(api, cond, result, deadline, stop, backoff, use_watch):
+    """LIST + WATCH until `cond` holds; polls with `backoff` when watching is not possible."""
+    last = None
+    while not stop.is_set() and time.monotonic() < deadline:
+        try:
+            path, params = collection(api, cond)
+            listing = api.get(path, params)
+        except (urllib.error.URLError, OSError, ValueError, LookupError) as e:
+            result["detail"] = f"not yet listable: {e}"
+        else:
+            objects = {_key(o): o for o in listing.get("items", [])}
+            met, result["detail"] = evaluate(cond, objects.values())
+            if met:
+                return True
+            if use_watch:
+                result["mode"] = "watch"
+                started, events = time.monotonic(), 0
+                try:
+                    rv = listing.get("metadata", {}).get("resourceVersion", "")
+                    for event in api.watch(path, params, rv, deadline - time.monotonic()):
+                        events += 1
+                        kind, obj = event.get("type"), event.get("object") or {}
+                        if kind == "ERROR":      # e.g. 410 Gone: relist
+                            break
+                        if kind == "DELETED":
+                            objects.pop(_key(obj), None)
+                        elif kind in ("ADDED", "MODIFIED"):
+                            objects[_key(obj)] = obj
+                        met, result["detail"] = evaluate(cond, objects.values())
+                        if met:
+                            return True
+                        if stop.is_set() or time.monotonic() >= deadline:
+                            return False
+                except (urllib.error.URLError, OSError, ValueError) as e:
+                    use_watch = False
+                    result["detail"] += f" (watch failed, polling: {e})"
+                else:
+                    if events or time.monotonic() - started >= 1:
+                        continue                    # stream ended normally: relist and watch again
+                    use_watch = False               # server closes watches immediately
+            result["mode"] = "poll"
+        progressed = result["detail"] != last
+        last = result["detail"]
+        stop.wait(min(backoff.next(progressed), max(0, deadline - time.monotonic())))
+    return False
+
+
+def wait_command(module, cond, result, deadline, stop, backoff):
+    last = None
+    result["mode"] = "command"
+    while not stop.is_set() and time.monotonic() < deadline:
+        rc, out, err = module.run_command(cond["command"], use_unsafe_shell=True)
+        if rc == 0:
+            result["detail"] = "exit 0"
+            return True
+        result["detail"] = f"exit {rc}: {(err or out).strip()[-200:]}"
+        progressed = result["detail"] != last
+        last = result["detail"]
+        stop.wait(min(backoff.next(progressed), max(0, deadline - time.monotonic())))
+    return False
+
+
+def run_all(module, api, conditions, timeout, use_watch, poll_initial, poll_max):
+    """Wait for every condition concurrently; returns (all met, results, elapsed)."""
+    start = time.monotonic()
+    deadline = start + timeout
+    stop = threading.Event()
+    results = [{"description": describe(c), "met": False, "elapsed": None, "mode": "poll", "detail": ""} for c in conditions]
+    lock = threading.Lock()
+
+    def worker(cond, result):
+        backoff = Backoff(poll_initial, poll_max)
+        try:
+            if cond.get("command"):
+                met = wait_command(module, cond, result, deadline, stop, backoff)
+            else:
+                met = wait_resource(api, cond, result, deadline, stop, backoff, use_watch)
+        except Exception as e:  # report, don't kill the other waiters
+            result["detail"] = f"error: {e}"
+            met = False
+        with lock:
+            if met:
+                result["elapsed"] = round(time.monotonic() - start, 2)
+            result["met"] = met
+
+    # daemon threads: a watch blocked in a read must not keep the module alive past the timeout
+    threads = [threading.Thread(target=worker, args=item, daemon=True) for item in zip(conditions, results)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(max(0, deadline - time.monotonic()))
+    stop.set()
+    # workers still blocked past the deadline keep writing into `results`; report what held at the deadline
+    with lock:
+        final = [dict(r) for r in results]
+    return all(r["met"] for r in final), final, round(time.monotonic() - start, 2)
+
+
+def main():
+    condition_spec = dict(
+        kind=dict(type="str"),
+        api_version=dict(type="str", default="v1"),
+        namespace=dict(type="str"),
+        name=dict(type="str"),
+        label_selector=dict(type="str"),
+        field_selector=dict(type="str"),
+        condition=dict(type="str"),
+        status=dict(type="str", default="True"),
+        field=dict(type="str"),
+        value=dict(type="str"),
+        min_count=dict(type="int", default=1),
+        all=dict(type="bool", default=True),
+        command=dict(type="str"),
+        description=dict(type="str"),
+    )
+    module = AnsibleModule(
+        argument_spec=dict(
+            conditions=dict(type="list", elements="dict", required=True, options=condition_spec,
+                            mutually_exclusive=[("kind", "command")], required_one_of=[("kind", "command")]),
+            timeout=dict(type="int", default=600),
+            kubeconfig=dict(type="path"),
+            context=dict(type="str"),
+            watch=dict(type="bool", default=True),
+            poll_initial=dict(type="float", default=1.0),
+            poll_max=dict(type="float", default=15.0),
+        ),
+        supports_check_mode=True,
+    )
+    p = module.params
+    conditions = p["conditions"]
+
+    api = None
+    with tempfile.TemporaryDirectory(prefix="k8s_wait-") as tmpdir:
+        if any(c.get("kind") for c in conditions):
+            if not HAS_YAML:
+                module.fail_json(msg=missing_required_lib("PyYAML"))
+            path = (p["kubeconfig"] or os.environ.get("K8S_AUTH_KUBECONFIG") or os.environ.get("KUBECONFIG")
+                    or os.path.expanduser("~/.kube/config"))
+            try:
+                api = KubeAPI(path, p["context"], tmpdir)
+            except (OSError, ValueError, KeyError, ssl.SSLError) as e:
+                module.fail_json(msg=f"cannot use kubeconfig {path}: {e}")
+        ok, results, elapsed = run_all(module, api, conditions, p["timeout"], p["watch"], p["poll_initial"], p["poll_max"])
+
+    if not ok:
+        pending = [f"{r['description']} ({r['detail']})" for r in results if not r["met"]]
+        module.fail_json(msg=f"timed out after {p['timeout']}s waiting for: " + "; ".join(pending),
+                         conditions=results, elapsed=elapsed)
+    module.exit_json(changed=False, conditions=results, elapsed=elapsed)
+
+
+if __name__ == "__main__":
+    main()
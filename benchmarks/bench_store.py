@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Keep disk-benchmark.sh results and flag I/O regressions between runs.
+
+disk-benchmark.sh only prints a copy-and-paste markdown table. This keeps
+each run in an append-only JSONL store, tagged with the node, the mount
+under test (nvme, ceph-rbd, cephfs, ...) and the date, so runs can be
+compared after a Ceph or NVMe change.
+
+Usage:
+  sudo MOUNT_PATH=/mnt/cephfs ./disk-benchmark.sh | tee run.log
+  python3 benchmarks/bench_store.py ingest --node worker1 --mount cephfs run.log
+  python3 benchmarks/bench_store.py report [--node worker1] [--mount cephfs] [--json]
+
+`report` shows, per node/mount/test, the latest value, the delta against
+the previous run and the p10/p50/p90 of all runs. It exits 1 when any
+test dropped by more than --threshold percent, so it can gate CI.
+docs/wiki/tools/build_all.py renders the same comparison on
+10-Benchmarking.md.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import re
+import sys
+
+STORE = "benchmarks/results/disk-benchmark.jsonl"
+
+# "| iozone 4K random read      | 39.06 MB/s |"
+TABLE_ROW = re.compile(r"^\|\s*iozone (\w+ (?:random|sequential) (?:read|write))\s*\|\s*([0-9.]+)\s*MB/s")
+
+
+def parse_results(lines):
+    """The iozone tests and MB/s values from disk-benchmark.sh's table."""
+    results = {}
+    for line in lines:
+        m = TABLE_ROW.match(line.strip())
+        if m:
+            results[m.group(1)] = float(m.group(2))
+    return results
+
+
+def load(store=STORE):
+    runs = []
+    try:
+        with open(store, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    runs.append(json.loads(line))
+    except FileNotFoundError:
+        pass
+    return runs
+
+
+def ingest(lines, node, mount, date=None, store=STORE):
+    results = parse_results(lines)
+    if not results:
+        raise SystemExit("ingest: no iozone result table found - pass disk-benchmark.sh's full output.")
+    run = {
+        "date": date or datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%d"),
+        "node": node,
+        "mount": mount,
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(store) or ".", exist_ok=True)
+    with open(store, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run, sort_keys=True) + "\n")
+    return run
+
+
+def percentile(values, q):
+    """Linear-interpolated percentile, q in [0, 100]."""
+    values = sorted(values)
+    if len(values) == 1:
+        return values[0]
+    pos = (len(values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+
+def compare(runs, threshold=10.0):
+    """One row per (node, mount, test), ordered by run date then ingest order."""
+    series = {}
+    for run in sorted(runs, key=lambda r: r["date"]):
+        for test, value in run["results"].items():
+            series.setdefault((run["node"], run["mount"], test), []).append((run["date"], value))
+    rows = []
+    for (node, mount, test), points in sorted(series.items()):
+        values = [v for _, v in points]
+        latest = values[-1]
+        previous = values[-2] if len(values) > 1 else None
+        delta = (latest - previous) / previous * 100 if previous else None
+        rows.append({
+            "node": node,
+            "mount": mount,
+            "test": test,
+            "date": points[-1][0],
+            "latest": latest,
+            "previous": previous,
+            "delta_pct": round(delta, 1) if delta is not None else None,
+            "p10": round(percentile(values, 10), 2),
+            "p50": round(percentile(values, 50), 2),
+            "p90": round(percentile(values, 90), 2),
+            "runs": len(values),
+            "regression": delta is not None and delta < -threshold,
+        })
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Store and compare disk-benchmark.sh runs.")
+    ap.add_argument("--store", default=STORE, help=f"JSONL result store (default: {STORE})")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    ing = sub.add_parser("ingest", help="append one disk-benchmark.sh run to the store")
+    ing.add_argument("--node", required=True, help="node the benchmark ran on, e.g. worker1")
+    ing.add_argument("--mount", required=True, help="storage under test: nvme, ceph-rbd, cephfs, ...")
+    ing.add_argument("--date", help="run date YYYY-MM-DD (default: today, UTC)")
+    ing.add_argument("log", nargs="?", default="-", help="disk-benchmark.sh output (default: stdin)")
+
+    rep = sub.add_parser("report", help="compare the latest run against history")
+    rep.add_argument("--node")
+    rep.add_argument("--mount")
+    rep.add_argument("--threshold", type=float, default=10.0,
+                     help="percent drop vs the previous run that counts as a regression (default: 10)")
+    rep.add_argument("--json", action="store_true", help="print rows as JSON")
+    args = ap.parse_args()
+
+    if args.cmd == "ingest":
+        if args.log == "-":
+            run = ingest(sys.stdin, args.node, args.mount, args.date, args.store)
+        else:
+            with open(args.log, encoding="utf-8", errors="ignore") as f:
+                run = ingest(f, args.node, args.mount, args.date, args.store)
+        print(f"Stored {len(run['results'])} results for {run['node']}/{run['mount']} ({run['date']}) in {args.store}")
+        return
+
+    runs = [r for r in load(args.store)
+            if (not args.node or r["node"] == args.node) and (not args.mount or r["mount"] == args.mount)]
+    rows = compare(runs, args.threshold)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print(f"{'node':<12} {'mount':<10} {'test':<20} {'latest':>9} {'prev':>9} {'delta':>7} {'p50':>9} {'runs':>4}")
+        for r in rows:
+            prev = f"{r['previous']:.2f}" if r["previous"] is not None else "-"
+            delta = f"{r['delta_pct']:+.1f}%" if r["delta_pct"] is not None else "-"
+            flag = "  REGRESSION" if r["regression"] else ""
+            print(f"{r['node']:<12} {r['mount']:<10} {r['test']:<20} {r['latest']:>9.2f} {prev:>9} {delta:>7} {r['p50']:>9.2f} {r['runs']:>4}{flag}")
+    if any(r["regression"] for r in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
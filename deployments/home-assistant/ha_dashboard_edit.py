@@ -32,6 +32,16 @@ environment variable — never hardcode it in this file or commit it
 anywhere. It's a real credential; the user may want it revoked from
 that same screen once done with it.
 
+EDITING SEVERAL DASHBOARDS AT ONCE
+----------------------------------
+HA_DASHBOARD_URL_PATH takes a comma-separated list
+(e.g. "dashboard-family,dashboard-kitchen"). The script authenticates
+once and pipelines the commands over that one connection: every
+`lovelace/config` fetch goes out back-to-back, replies are matched to
+requests by their `id`, then every `lovelace/config/save` goes out the
+same way. A bulk edit costs one round trip per batch, not one
+`kubectl exec` plus handshake per dashboard.
+
 FINDING THE RIGHT DASHBOARD URL PATH
 -------------------------------------
 The url_path is NOT necessarily the dashboard's title. Check the real
@@ -53,6 +63,54 @@ script doesn't install anything — it only edits dashboard *config*. Edit
 NEW_CARDS below for whatever you're adding; leave it empty to just print
 the current config without changing anything.
 
+DECLARATIVE SPEC
+----------------
+For anything beyond a quick append, describe the desired state in a JSON
+(or YAML — HA's own Python ships PyYAML) file and point HA_DASHBOARD_SPEC
+at it after `kubectl cp`-ing it into the pod next to the script:
+
+    {
+      "dashboard-family": {
+        "Home":    {"add":   [{"type": "weather-forecast", "entity": "weather.home"}]},
+        "Weather": {"cards": [{"type": "custom:weather-radar-card"}]}
+      }
+    }
+
+Top-level keys are url_paths (HA_DASHBOARD_URL_PATH defaults to all of
+them); each view is matched by its `path`, then its `title`, then as a
+0-based index ("0"), and is appended if no view matches. `cards` is the
+view's exact card list; `add` only appends cards not already present.
+NEW_CARDS is shorthand for `{"0": {"add": NEW_CARDS}}` on every dashboard.
+
+The spec is applied to a copy of the fetched config and the two are
+diffed structurally; the script prints the changes and only sends
+`lovelace/config/save` for dashboards whose diff is non-empty. Rerunning
+an already-applied spec writes nothing, so HA neither rewrites its
+.storage file nor reloads the frontend.
+
+SNAPSHOTS, DRY RUNS AND OFFLINE PLANNING
+----------------------------------------
+Every fetched config is kept as a snapshot in HA_DASHBOARD_CACHE
+(default /tmp/ha-dashboard-cache, one <url_path>.json each, holding the
+config, its sha256 and when it was fetched). Dry runs plan against the
+snapshot and fetch only dashboards without one; HA_REFRESH=1 refetches
+them all. A run that saves fetches every dashboard it has a spec for
+first, and when one differs from its snapshot (edited in the UI, or
+drifted some other way) the snapshot is refreshed and the plan is made
+against the live config.
+
+  HA_DRY_RUN=1  plan and print the diff, never save
+  HA_OFFLINE=1  same, from snapshots alone: no token, no connection, no
+                pod - e.g. after copying the cache out with
+                `kubectl cp home-assistant/home-assistant-0:/tmp/ha-dashboard-cache ./ha-dashboard-cache -c home-assistant`
+                and running locally with HA_DASHBOARD_CACHE=./ha-dashboard-cache
+
+Before saving, the dashboards with changes are re-fetched in one batch and
+their hash compared with the snapshot the plan was made from. If someone
+edited the dashboard in the UI meanwhile, that dashboard is not saved:
+its snapshot is refreshed and the script asks for a rerun, so the new plan
+(and its diff) is reviewed against what is really live.
+
 VERIFYING THE RESULT
 ---------------------
     kubectl exec -n home-assistant home-assistant-0 -c home-assistant -- \\
@@ -64,64 +122,284 @@ field from lovelace_dashboards, e.g. "dashboard_family" -> file
 """
 
 import asyncio
+import copy
+import datetime
+import hashlib
 import json
 import os
 import sys
 
-import websockets
+try:
+    import websockets
+except ImportError:  # only needed online; HA's own Python ships it
+    websockets = None
 
 TOKEN = os.environ.get("HA_TOKEN")
 URL = os.environ.get("HA_WEBSOCKET_URL", "ws://localhost:8123/api/websocket")
-DASHBOARD_URL_PATH = os.environ.get("HA_DASHBOARD_URL_PATH", "")
+DASHBOARD_URL_PATHS = [p.strip() for p in os.environ.get("HA_DASHBOARD_URL_PATH", "").split(",") if p.strip()]
+SPEC_PATH = os.environ.get("HA_DASHBOARD_SPEC", "")
+CACHE_DIR = os.environ.get("HA_DASHBOARD_CACHE", "/tmp/ha-dashboard-cache")
+OFFLINE = os.environ.get("HA_OFFLINE") == "1"
+DRY_RUN = OFFLINE or os.environ.get("HA_DRY_RUN") == "1"
+REFRESH = os.environ.get("HA_REFRESH") == "1"
 
-# Cards to append to the dashboard's first view. Edit this list for
+# Cards to append to each dashboard's first view. Edit this list for
 # whatever cards you're adding next; leave empty ([]) to just print the
 # current config without changing anything.
 NEW_CARDS = []
 
+MISSING = object()  # marks a key/index present on only one side of a diff
 
-async def main():
-    if not TOKEN:
-        sys.exit("HA_TOKEN environment variable is required (see module docstring)")
-    if not DASHBOARD_URL_PATH:
-        sys.exit("HA_DASHBOARD_URL_PATH environment variable is required (see module docstring)")
 
-    async with websockets.connect(URL) as ws:
+def config_hash(config):
+    return hashlib.sha256(json.dumps(config, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def snapshot_file(path):
+    return os.path.join(CACHE_DIR, f"{path}.json")
+
+
+def load_snapshot(path):
+    try:
+        with open(snapshot_file(path), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_snapshot(path, config):
+    snapshot = {
+        "url_path": path,
+        "hash": config_hash(config),
+        "fetched_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "config": config,
+    }
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = snapshot_file(path) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, indent=2)
+    os.replace(tmp, snapshot_file(path))
+    return snapshot
+
+
+def load_spec(path):
+    """Desired state: {url_path: {view: {"cards": [...]} or {"add": [...]}}}."""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml  # ships with Home Assistant
+
+            return yaml.safe_load(f) or {}
+        return json.load(f)
+
+
+def find_view(views, key):
+    key = str(key)
+    for view in views:
+        if key in (view.get("path"), view.get("title")):
+            return view
+    if key.isdigit() and int(key) < len(views):
+        return views[int(key)]
+    return None
+
+
+def apply_spec(config, view_specs):
+    """Return a copy of `config` with each view's spec applied; `config` is untouched."""
+    config = copy.deepcopy(config)
+    views = config.setdefault("views", [])
+    for key, spec in view_specs.items():
+        view = find_view(views, key)
+        if view is None:
+            view = {"title": str(key), "cards": []}
+            views.append(view)
+        if "cards" in spec:
+            view["cards"] = copy.deepcopy(spec["cards"])
+        for card in spec.get("add", []):
+            cards = view.setdefault("cards", [])
+            if card not in cards:
+                cards.append(copy.deepcopy(card))
+    return config
+
+
+def diff(old, new, path=""):
+    """Structural differences between two JSON values, as (path, old, new) triples."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in list(old) + [k for k in new if k not in old]:
+            changes += diff(old.get(key, MISSING), new.get(key, MISSING), f"{path}.{key}" if path else key)
+        return changes
+    if isinstance(old, list) and isinstance(new, list):
+        changes = []
+        for i in range(max(len(old), len(new))):
+            changes += diff(old[i] if i < len(old) else MISSING, new[i] if i < len(new) else MISSING, f"{path}[{i}]")
+        return changes
+    return [] if old == new else [(path, old, new)]
+
+
+def format_change(change):
+    path, old, new = change
+    if old is MISSING:
+        return f"+ {path}: {json.dumps(new)}"
+    if new is MISSING:
+        return f"- {path}: {json.dumps(old)}"
+    return f"~ {path}: {json.dumps(old)} -> {json.dumps(new)}"
+
+
+class HAClient:
+    """One authenticated WebSocket connection with pipelined commands.
+
+    Commands are sent without waiting for earlier replies; a single reader
+    task resolves each command's future when the reply with its `id`
+    arrives, in whatever order HA answers.
+    """
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.next_id = 1
+        self.pending = {}  # message id -> Future awaiting HA's reply
+        self.reader = asyncio.create_task(self._read())
+
+    @classmethod
+    async def connect(cls, url, token):
+        ws = await websockets.connect(url)
         msg = json.loads(await ws.recv())
         assert msg["type"] == "auth_required", msg
-        await ws.send(json.dumps({"type": "auth", "access_token": TOKEN}))
+        await ws.send(json.dumps({"type": "auth", "access_token": token}))
         msg = json.loads(await ws.recv())
         assert msg["type"] == "auth_ok", msg
         print("authenticated")
+        return cls(ws)
 
-        msg_id = 1
-
-        async def call(payload):
-            nonlocal msg_id
-            payload["id"] = msg_id
-            msg_id += 1
-            await ws.send(json.dumps(payload))
-            while True:
-                resp = json.loads(await ws.recv())
-                if resp.get("id") == payload["id"]:
-                    return resp
-
-        resp = await call({"type": "lovelace/config", "url_path": DASHBOARD_URL_PATH})
-        if not resp["success"]:
-            print("FETCH FAILED:", resp)
-            return
-        config = resp["result"]
-        print("current cards:", [c.get("type") for c in config["views"][0]["cards"]])
+    async def _read(self):
+        error = ConnectionError("websocket closed")
+        try:
+            async for raw in self.ws:
+                msg = json.loads(raw)
+                future = self.pending.pop(msg.get("id"), None)
+                if future and not future.done():
+                    future.set_result(msg)
+        except websockets.ConnectionClosed as e:
+            error = ConnectionError(f"websocket closed: {e}")
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self.pending.clear()
+
+    async def call(self, payload):
+        payload = dict(payload, id=self.next_id)
+        self.next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self.pending[payload["id"]] = future
+        await self.ws.send(json.dumps(payload))
+        return await future
+
+    async def call_many(self, payloads):
+        """Send every payload before waiting on any; replies come back in payload order."""
+        return await asyncio.gather(*(self.call(p) for p in payloads))
+
+    async def close(self):
+        await self.ws.close()
+        await self.reader
+
+    async def __aenter__(self):
+        return self
 
-        if not NEW_CARDS:
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+def plan(snapshots, specs):
+    """Print each dashboard's cards and diff; return {url_path: desired config} for those that change."""
+    changed = {}
+    for path, snapshot in snapshots.items():
+        config = snapshot["config"]
+        print(f"{path}: current cards (snapshot {snapshot['fetched_at']}):",
+              [c.get("type") for c in config["views"][0].get("cards", [])])
+        if path not in specs:
+            continue
+        desired = apply_spec(config, specs[path])
+        changes = diff(config, desired)
+        if not changes:
+            print(f"{path}: up to date, not saving")
+            continue
+        print(f"{path}: {len(changes)} change(s)")
+        for change in changes:
+            print("  " + format_change(change))
+        changed[path] = desired
+    return changed
+
+
+async def main():
+    specs = load_spec(SPEC_PATH) if SPEC_PATH else {}
+    paths = DASHBOARD_URL_PATHS or list(specs)
+    if not paths:
+        sys.exit("HA_DASHBOARD_URL_PATH or HA_DASHBOARD_SPEC environment variable is required (see module docstring)")
+    if NEW_CARDS:
+        for path in paths:
+            specs.setdefault(path, {}).setdefault("0", {}).setdefault("add", []).extend(NEW_CARDS)
+    snapshots = {path: None if REFRESH else load_snapshot(path) for path in paths}
+
+    if OFFLINE:
+        missing = [path for path, snapshot in snapshots.items() if snapshot is None]
+        if missing:
+            sys.exit(f"no snapshot for {', '.join(missing)} in {CACHE_DIR} - run once online (HA_DRY_RUN=1) first")
+        plan(snapshots, specs)
+        print("offline dry run, nothing saved")
+        return
+
+    if not TOKEN:
+        sys.exit("HA_TOKEN environment variable is required (see module docstring)")
+    if websockets is None:
+        sys.exit("the websockets package is required unless HA_OFFLINE=1")
+
+    async with await HAClient.connect(URL, TOKEN) as ha:
+        missing = [path for path, snapshot in snapshots.items() if snapshot is None]
+        # a run that saves plans against what is live, not against a possibly stale snapshot
+        stale = [] if DRY_RUN else [path for path, snapshot in snapshots.items() if snapshot and path in specs]
+        fetch = missing + stale
+        fetched = await ha.call_many({"type": "lovelace/config", "url_path": path} for path in fetch)
+        for path, resp in zip(fetch, fetched):
+            if not resp["success"]:
+                print(f"{path}: FETCH FAILED:", resp)
+                del snapshots[path]
+                continue
+            previous = snapshots[path]
+            if previous and config_hash(resp["result"]) == previous["hash"]:
+                continue
+            if previous:
+                print(f"{path}: live config differs from the snapshot of {previous['fetched_at']} - "
+                      "snapshot refreshed, planning against the live config")
+            snapshots[path] = save_snapshot(path, resp["result"])
+
+        changed = plan(snapshots, specs)
+        if not changed:
+            return
+        if DRY_RUN:
+            print("dry run, nothing saved")
             return
 
-        config["views"][0]["cards"].extend(NEW_CARDS)
+        # Revalidate: the plan is only valid if nobody edited the dashboard since its snapshot
+        live = await ha.call_many({"type": "lovelace/config", "url_path": path} for path in changed)
+        ready = {}
+        for path, resp in zip(changed, live):
+            if not resp["success"]:
+                print(f"{path}: REVALIDATE FAILED:", resp)
+                continue
+            if config_hash(resp["result"]) != snapshots[path]["hash"]:
+                save_snapshot(path, resp["result"])
+                print(f"{path}: edited in HA since the snapshot of {snapshots[path]['fetched_at']} - "
+                      "snapshot refreshed, NOT saving; rerun to re-plan against it")
+                continue
+            ready[path] = changed[path]
 
-        resp = await call(
-            {"type": "lovelace/config/save", "url_path": DASHBOARD_URL_PATH, "config": config}
+        saved = await ha.call_many(
+            {"type": "lovelace/config/save", "url_path": path, "config": config}
+            for path, config in ready.items()
         )
-        print("save result:", resp["success"], resp.get("error"))
+        for path, resp in zip(ready, saved):
+            print(f"{path}: save result:", resp["success"], resp.get("error"))
+            if resp["success"]:
+                save_snapshot(path, ready[path])
 
 
 asyncio.run(main())
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the wiki generator (build_all.py).
+
+Generates a synthetic repo tree of a given size - N Kubernetes manifests,
+M memory-bank notes, K images, plus the README/inventory/config/ADR files
+the builders look for - and times build_all.py against it:
+
+- uncached: every builder on its own, with the shared indexes (repo walk,
+  ManifestIndex, MemoryBank) dropped before each one, so it pays for
+  every scan it triggers - what each page would cost without sharing
+- cached: the indexes loaded once (timed separately as "indexes", like
+  main() does up front), then every builder against them
+- main / incremental: a full `build_all.main()` run, then an
+  `--incremental` re-run over the unchanged tree
+
+Per builder it reports the best wall time over --repeat runs and the
+number of files opened for reading (plus how many distinct ones), so a
+scanner that starts re-reading the tree shows up as a read-count jump
+even when the timing noise hides it.
+
+Usage:
+  python docs/wiki/tools/bench_build_all.py --manifests 500 --notes 1000 --images 200
+  python docs/wiki/tools/bench_build_all.py --out bench.json
+  python docs/wiki/tools/bench_build_all.py --baseline bench.json --threshold 25
+
+Results are printed as JSON (or written to --out). With --baseline, the
+run is compared against an earlier result file and exits 1 when any
+cached builder got more than --threshold percent slower or reads more
+files than before, so it can gate publish-wiki.yml changes.
+"""
+
+import argparse, builtins, contextlib, io, json, os, pathlib, platform, sys, tempfile, time
+
+import build_all
+
+TOPIC_WORDS = ["ceph", "rbd", "cephfs", "osd", "metallb", "traefik", "ingress", "pihole", "argocd", "helm",
+               "ansible", "cert", "tls", "keycloak", "prometheus", "grafana", "plex", "n8n", "openwebui",
+               "bedrock", "bootstrap", "cold start", "runbook", "troubleshoot", "error", "architecture"]
+IMAGE_KEYS = ["arch", "diagram", "rack", "topology", "network", "ingress", "ceph", "grafana", "misc"]
+
+# a 1x1 PNG, so list_images() has real files to look at
+PNG = bytes.fromhex("89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+                    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082")
+
+MANIFEST = """\
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: app{i}
+  namespace: ns{ns}
+spec:
+  replicas: 1
+  template:
+    spec:
+      containers:
+        - name: app{i}
+          image: ghcr.io/example/app{i}:latest
+          args:
+            - |
+              echo "kind: NotAResource inside a block scalar"
+---
+apiVersion: v1
+kind: Service
+metadata:
+  name: app{i}
+  namespace: ns{ns}
+spec:
+  ports:
+    - port: 80
+"""
+EXTRA = [
+    (10, "---\napiVersion: storage.k8s.io/v1\nkind: StorageClass\nmetadata:\n  name: rook-ceph-block-{i}\nprovisioner: rook-ceph.rbd.csi.ceph.com\n"),
+    (25, "---\napiVersion: metallb.io/v1beta1\nkind: IPAddressPool\nmetadata:\n  name: pool{i}\n  namespace: metallb-system\nspec:\n  addresses: [192.168.{i}.240-192.168.{i}.250]\n"),
+    (7, "---\napiVersion: argoproj.io/v1alpha1\nkind: Application\nmetadata:\n  name: app{i}\n  namespace: argocd\n"),
+    (5, "---\napiVersion: traefik.io/v1alpha1\nkind: IngressRoute\nmetadata:\n  name: app{i}\n  namespace: ns{ns}\n"),
+]
+
+def make_tree(root, manifests, notes, images):
+    """Write a synthetic checkout under `root` for build_all.py to scan."""
+    root = pathlib.Path(root)
+    def put(rel, data):
+        p = root / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        (p.write_bytes if isinstance(data, bytes) else p.write_text)(data)
+    put("README.md", "# Synthetic Homelab\n\nBenchmark tree.\n\n## Architecture\n\n"
+        + "Nodes, Ceph and MetalLB.\n" * 20 + "\n## Other\n\nText.\n")
+    put("ansible/inventory.ini", "[control]\nnode0\n\n[workers]\n" + "".join(f"node{i}\n" for i in range(1, 8)))
+    put("ansible/group_vars/all/config.yml", "".join(f"enable_app{i}: true\n" for i in range(40)))
+    put("ansible/playbook.yml", "- hosts: all\n  tasks: []\n")
+    for i in range(manifests):
+        text = MANIFEST.format(i=i, ns=i % 12) + "".join(t.format(i=i % 250, ns=i % 12) for every, t in EXTRA if i % every == 0)
+        put(f"deployments/app{i % 50}/app{i}.yaml", text)
+    for j in range(notes):
+        words = [TOPIC_WORDS[(j * 7 + k) % len(TOPIC_WORDS)] for k in range(6)]
+        body = " ".join(words) + ". " + "Notes about the cluster and what was changed. " * 8
+        put(f"docs/wiki/memory_bank/2025-{1 + j % 12:02d}-{1 + j % 28:02d}-note-{j}.md",
+            f"# Note {j}: {words[0]} and {words[1]}\n\n{body}\n")
+    for k in range(images):
+        put(f"docs/wiki/images/{IMAGE_KEYS[k % len(IMAGE_KEYS)]}-{k}.png", PNG)
+    for a in range(1, 6):
+        put(f"docs/adr/ADR-{a:03d}-decision.md", f"# ADR-{a:03d}\n\nDecision {a}.\n")
+
+class ReadCounter:
+    """Counts files opened for reading through open()/io.open()/pathlib."""
+
+    def __init__(self):
+        self.opens = 0
+        self.paths = set()
+
+    @contextlib.contextmanager
+    def __call__(self):
+        real = io.open
+        def counting_open(file, mode="r", *args, **kwargs):
+            if not any(c in mode for c in "wax+"):
+                self.opens += 1
+                self.paths.add(os.fspath(file) if not isinstance(file, int) else file)
+            return real(file, mode, *args, **kwargs)
+        io.open = builtins.open = counting_open
+        try:
+            yield self
+        finally:
+            io.open = builtins.open = real
+
+def reset_caches():
+    for fn in (build_all.repo_files, build_all.manifest_index, build_all.memory_bank, build_all.input_digest):
+        fn.cache_clear()
+
+def builders():
+    return [(fn.__name__, fn) for _, fn, _ in build_all.PAGES] + [("summarize_memory_into_topics", build_all.summarize_memory_into_topics)]
+
+def measure(fn, repeat, before=None):
+    """Best wall time of `fn` over `repeat` runs, and the reads of the last one."""
+    best = None
+    for _ in range(repeat):
+        if before: before()
+        counter = ReadCounter()
+        with counter(), contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return {"seconds": round(best, 6), "reads": counter.opens, "distinct_reads": len(counter.paths)}
+
+def load_indexes():
+    build_all.repo_files(); build_all.manifest_index(); build_all.memory_bank()
+
+def run(args):
+    results = {"params": {"manifests": args.manifests, "notes": args.notes, "images": args.images, "repeat": args.repeat},
+               "python": platform.python_version()}
+    with tempfile.TemporaryDirectory(prefix="wiki-bench-") as tmp:
+        make_tree(tmp, args.manifests, args.notes, args.images)
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            build_all.ensure_dirs()
+            results["uncached"] = {name: measure(fn, args.repeat, reset_caches) for name, fn in builders()}
+            results["indexes"] = measure(load_indexes, args.repeat, reset_caches)
+            results["cached"] = {name: measure(fn, args.repeat) for name, fn in builders()}
+            manifest = pathlib.Path(tmp) / ".cache/wiki/build-manifest.json"
+            results["main"] = measure(lambda: build_all.main(["--manifest", str(manifest), "--jobs", "1"]), 1, reset_caches)
+            results["incremental"] = measure(lambda: build_all.main(["--incremental", "--manifest", str(manifest), "--jobs", "1"]), 1, reset_caches)
+        finally:
+            os.chdir(cwd)
+            reset_caches()
+    for mode in ("uncached", "cached"):
+        results[mode + "_total"] = {
+            "seconds": round(sum(r["seconds"] for r in results[mode].values()), 6),
+            "reads": sum(r["reads"] for r in results[mode].values()),
+        }
+    results["cached_total"]["seconds"] = round(results["cached_total"]["seconds"] + results["indexes"]["seconds"], 6)
+    results["cached_total"]["reads"] += results["indexes"]["reads"]
+    return results
+
+def compare(current, baseline, threshold):
+    """Regressions of `current` against `baseline`, as human-readable lines."""
+    out = []
+    if current["params"] != baseline.get("params"):
+        out.append(f"note: tree size differs from the baseline ({baseline.get('params')} vs {current['params']})")
+    rows = dict(current["cached"], indexes=current["indexes"])
+    base = dict(baseline.get("cached", {}), indexes=baseline.get("indexes", {}))
+    for name, r in rows.items():
+        b = base.get(name)
+        if not b: continue
+        if b["seconds"] > 0 and (r["seconds"] - b["seconds"]) / b["seconds"] * 100 > threshold:
+            out.append(f"{name}: {b['seconds']:.4f}s -> {r['seconds']:.4f}s (+{(r['seconds'] / b['seconds'] - 1) * 100:.0f}%)")
+        if r["reads"] > b["reads"]:
+            out.append(f"{name}: {b['reads']} -> {r['reads']} file reads")
+    return out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark build_all.py on a synthetic repo tree.")
+    ap.add_argument("--manifests", type=int, default=200, help="YAML manifests to generate (default: %(default)s)")
+    ap.add_argument("--notes", type=int, default=300, help="memory-bank notes to generate (default: %(default)s)")
+    ap.add_argument("--images", type=int, default=50, help="images to generate (default: %(default)s)")
+    ap.add_argument("--repeat", type=int, default=3, help="runs per builder; the best time is kept (default: %(default)s)")
+    ap.add_argument("--out", type=pathlib.Path, help="write the JSON result here instead of stdout")
+    ap.add_argument("--baseline", type=pathlib.Path, help="earlier result file to compare against")
+    ap.add_argument("--threshold", type=float, default=25.0, help="allowed slowdown in percent (default: %(default)s)")
+    args = ap.parse_args(argv)
+
+    results = run(args)
+    text = json.dumps(results, indent=2, sort_keys=True) + "\n"
+    if args.out:
+        args.out.write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+    if args.baseline:
+        problems = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+        for line in problems:
+            print(line, file=sys.stderr)
+        if any(not line.startswith("note:") for line in problems):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Streaming parsers for benchmark logs (fio, iperf, sysbench, iozone).
+
+Every parser is a small line-at-a-time state machine, so a log is read
+exactly once through `parse_file()` and memory stays flat no matter how big
+the file is (multi-megabyte fio JSON included). Each parser turns what it
+recognises into Row(tool, test, metric, value, unit) records that
+build_all.py renders as comparison tables on 10-Benchmarking.md.
+
+Recognised output:
+- fio: classic text (`read: IOPS=..., BW=...`) and --output-format=json
+- iperf2 / iperf3: per-stream summary lines (sender/receiver)
+- sysbench: cpu/memory/fileio summary lines
+- iozone: raw `-a` result rows and the copy-paste table printed by
+  benchmarks/disk-benchmark.sh
+"""
+
+import collections, itertools, re
+
+Row = collections.namedtuple("Row", "tool test metric value unit")
+
+_NUM = r"([0-9]+(?:\.[0-9]+)?)"
+_SI = {"": 1, "k": 1e3, "K": 1e3, "m": 1e6, "M": 1e6, "g": 1e9, "G": 1e9}
+_BYTES = {"B": 1 / 2**20, "KiB": 1 / 1024, "MiB": 1, "GiB": 1024, "kB": 1e3 / 2**20, "KB": 1e3 / 2**20, "MB": 1e6 / 2**20, "GB": 1e9 / 2**20}
+
+def head_lines(path, limit=80):
+    """First `limit` lines of a file, without reading the rest of it."""
+    try:
+        with open(path, encoding="utf-8", errors="ignore") as fh:
+            return [l.rstrip("\n") for l in itertools.islice(fh, limit)]
+    except OSError:
+        return []
+
+class FioText:
+    JOB = re.compile(r"^(\S+): \(g=\d+\): rw=(\w+)")
+    GROUP = re.compile(r"^(\S+): \(groupid=\d+")
+    IO = re.compile(r"^\s+(read|write|trim)\s*: IOPS=" + _NUM + r"([kKmM]?), BW=" + _NUM + r"(B|KiB|MiB|GiB)/s")
+
+    def __init__(self):
+        self.job = None
+
+    def feed(self, line):
+        m = self.JOB.match(line) or self.GROUP.match(line)
+        if m:
+            self.job = m.group(1)
+            return
+        m = self.IO.match(line)
+        if m and self.job:
+            op, iops, si, bw, unit = m.groups()
+            yield Row("fio", f"{self.job} {op}", "IOPS", float(iops) * _SI[si], "")
+            yield Row("fio", f"{self.job} {op}", "BW", round(float(bw) * _BYTES[unit], 2), "MiB/s")
+
+class FioJson:
+    """fio --output-format=json, read line by line (fio pretty-prints it)."""
+    JOBNAME = re.compile(r'^\s*"jobname"\s*:\s*"([^"]*)"')
+    SECTION = re.compile(r'^(\s*)"(read|write|trim)"\s*:\s*\{')
+    FIELD = re.compile(r'^\s*"(bw|iops)"\s*:\s*' + _NUM)
+
+    def __init__(self):
+        self.job = self.op = None
+        self.depth = None
+        self.seen = set()
+
+    def feed(self, line):
+        m = self.JOBNAME.match(line)
+        if m:
+            self.job, self.op = m.group(1), None
+            return
+        m = self.SECTION.match(line)
+        if m and self.job:
+            self.op, self.depth, self.seen = m.group(2), len(m.group(1)), set()
+            return
+        if self.op is None: return
+        if line.strip().startswith("}") and len(line) - len(line.lstrip()) <= self.depth:
+            self.op = None
+            return
+        m = self.FIELD.match(line)
+        # only the section's own bw/iops, not the nested *_min/*_max/percentiles
+        if m and m.group(1) not in self.seen and len(line) - len(line.lstrip()) == self.depth + 2:
+            self.seen.add(m.group(1))
+            v = float(m.group(2))
+            if v == 0: return
+            if m.group(1) == "bw":
+                yield Row("fio", f"{self.job} {self.op}", "BW", round(v / 1024, 2), "MiB/s")
+            else:
+                yield Row("fio", f"{self.job} {self.op}", "IOPS", round(v, 2), "")
+
+class Iperf:
+    LINE = re.compile(r"^\[\s*(\w+)\]\s+" + _NUM + r"\s*-\s*" + _NUM + r"\s+sec\s+" + _NUM + r"\s+\w?Bytes\s+"
+                      + _NUM + r"\s+([KMG]?)bits/sec(?:\s*$|.*?\b(sender|receiver)\b)")
+
+    def feed(self, line):
+        m = self.LINE.match(line)
+        if not m: return
+        stream, start, _, _, rate, si, role = m.groups()
+        # iperf3 tags its end-of-run totals. iperf2 does not: its summary is the
+        # last interval starting at 0, which overwrites any earlier 0-start one.
+        if role or float(start) == 0:
+            yield Row("iperf", f"stream {stream} {role or 'total'}", "Throughput",
+                      round(float(rate) * _SI[si] / 1e6, 2), "Mbit/s")
+
+class Sysbench:
+    PATTERNS = [
+        (re.compile(r"^\s*events per second:\s*" + _NUM), "events/s", ""),
+        (re.compile(r"^.*transferred \(" + _NUM + r" MiB/sec\)"), "memory", "MiB/s"),
+        (re.compile(r"^\s*read, MiB/s:\s*" + _NUM), "read", "MiB/s"),
+        (re.compile(r"^\s*written, MiB/s:\s*" + _NUM), "written", "MiB/s"),
+        (re.compile(r"^\s*avg:\s*" + _NUM), "latency avg", "ms"),
+    ]
+    MODE = re.compile(r"\b(cpu|memory|fileio|threads|mutex)\b")
+
+    def __init__(self):
+        self.test = "sysbench"
+        self.active = False
+
+    def feed(self, line):
+        if line.startswith("sysbench "):
+            self.active = True
+            m = self.MODE.search(line)
+            if m: self.test = m.group(1)
+            return
+        if not self.active: return
+        if line.startswith("Prime numbers limit"): self.test = "cpu"
+        elif line.startswith("Extra file open flags"): self.test = "fileio"
+        elif "memory speed test" in line: self.test = "memory"
+        for rx, metric, unit in self.PATTERNS:
+            m = rx.match(line)
+            if m:
+                yield Row("sysbench", self.test, metric, float(m.group(1)), unit)
+                return
+
+class Iozone:
+    TABLE = re.compile(r"^\|\s*iozone (\w+) (random|sequential) (read|write)\s*\|\s*" + _NUM + r"\s*MB/s")
+    # kB reclen write rewrite read reread random-read random-write
+    RAW = re.compile(r"^\s*(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s*$")
+
+    def feed(self, line):
+        m = self.TABLE.match(line)
+        if m:
+            size, kind, op, v = m.groups()
+            yield Row("iozone", f"{size} {kind}", op, float(v), "MB/s")
+            return
+        m = self.RAW.match(line)
+        if m:
+            # same columns disk-benchmark.sh picks with awk ($4 $6 $7 $8), KB/s -> MB/s
+            f = [int(x) for x in m.groups()]
+            rec = f"{f[1]}K" if f[1] < 1024 else f"{f[1] // 1024}M"
+            yield Row("iozone", f"{rec} random", "read", round(f[6] / 1024, 2), "MB/s")
+            yield Row("iozone", f"{rec} random", "write", round(f[7] / 1024, 2), "MB/s")
+            if f[1] >= 1024:
+                yield Row("iozone", f"{rec} sequential", "read", round(f[5] / 1024, 2), "MB/s")
+                yield Row("iozone", f"{rec} sequential", "write", round(f[3] / 1024, 2), "MB/s")
+
+PARSERS = (FioText, FioJson, Iperf, Sysbench, Iozone)
+
+def parse_lines(lines):
+    """Feed every line to every parser once; yields Rows in file order."""
+    parsers = [cls() for cls in PARSERS]
+    for line in lines:
+        line = line.rstrip("\n")
+        for p in parsers:
+            yield from p.feed(line)
+
+def parse_file(path):
+    try:
+        with open(path, encoding="utf-8", errors="ignore") as fh:
+            # disk-benchmark.sh prints both the raw iozone rows and its summary
+            # table, so the same measurement can show up twice: last one wins
+            rows = {(r.tool, r.test, r.metric): r for r in parse_lines(fh)}
+    except OSError:
+        return []
+    return list(rows.values())
@@ -7,14 +7,31 @@ One-shot wiki generator (self-contained):
 
 Usage:
   python docs/wiki/tools/build_all.py
+  python docs/wiki/tools/build_all.py --incremental   # rebuild only pages whose inputs changed
+  python docs/wiki/tools/build_all.py --jobs 8        # run independent builders concurrently
+  python docs/wiki/tools/build_all.py --profile       # per-builder time/read/regex table (see build_profile.py)
+  python docs/wiki/tools/build_all.py --profile-out build.pstats   # ... plus a cProfile dump
 """
 
-import pathlib, re, datetime
+import argparse, contextlib, datetime, functools, hashlib, json, os, pathlib, re, sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from bench_logs import head_lines, parse_file as parse_bench_log
+from build_profile import Profiler, CONCURRENT as PROFILE_CONCURRENT
+from k8s_resources import iter_resources
+from memory_bank import SUMMARY_TOPICS, MemoryBank
+from repo_walk import PRUNE, RepoFiles
+
+# disk-benchmark.sh's result store lives next to it, outside this directory
+sys.path.append(str(pathlib.Path(__file__).resolve().parents[3] / "benchmarks"))
+from bench_store import STORE as BENCH_STORE, compare as compare_bench_runs, load as load_bench_runs
 
 ROOT = pathlib.Path(".")
 WIKI = ROOT / "docs/wiki"
 IMAGES = WIKI / "images"
 MB = WIKI / "memory_bank"
+BUILD_MANIFEST = ROOT / ".cache/wiki/build-manifest.json"
+STAMP_RE = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2} UTC")
 
 def ensure_dirs():
     WIKI.mkdir(parents=True, exist_ok=True)
@@ -28,13 +45,29 @@ def read_text(p):
         return ""
 
 def write_text(path, text):
-    pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
-    pathlib.Path(path).write_text(text, encoding="utf-8")
+    """Write `text` unless the page already holds the same content.
+
+    The generated-at stamp is ignored in the comparison, so re-running the
+    generator over unchanged sources leaves files (and wiki diffs) untouched.
+    Returns True when the file was actually written.
+    """
+    path = pathlib.Path(path)
+    old = read_text(path) if path.exists() else None
+    if old is not None and STAMP_RE.sub("", old) == STAMP_RE.sub("", text):
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return True
 
 def now_utc():
     return datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
 
 # ---------- repo scanners ----------
+@functools.lru_cache(maxsize=None)
+def repo_files():
+    """The one pruned walk over the checkout that every scanner shares."""
+    return RepoFiles(ROOT, PRUNE)
+
 def list_images(keys=("arch","diagram","rack","topology","layout","network","ingress","traefik","ceph","storage","grafana","pihole","openwebui","plex")):
     out=[]
     if IMAGES.exists():
@@ -45,26 +78,56 @@ def list_images(keys=("arch","diagram","rack","topology","layout","network","ing
                 out.append(f"images/{p.name}")
     return out
 
+class ManifestIndex:
+    """Every YAML manifest in the repo, read once and shared by all builders.
+
+    Builders used to call grep_yaml() independently, and each call walked the
+    whole tree (vendored ansible_collections included) and re-read every file.
+    The index reads each file from the shared repo walk (repo_files()) exactly
+    once; keyword lookups are then served
+    from memory and memoized per pattern, and every file's Kubernetes
+    resources are extracted once (see k8s_resources.py) for `kind` lookups.
+    """
+    def __init__(self, files):
+        self.files=[]       # [(path, text)] in path order
+        self.resources=[]   # [Resource] in path/document order
+        self.kinds={}       # kind -> [(path, text)] of files defining one
+        for p in files.suffix(".yaml", ".yml"):
+            # skip workflow files
+            if ".github/workflows" in str(p): continue
+            t = read_text(p)
+            self.files.append((str(p), t))
+            found = list(iter_resources(t.splitlines(), p))
+            self.resources.extend(found)
+            for kind in dict.fromkeys(r.kind for r in found):
+                self.kinds.setdefault(kind, []).append((str(p), t))
+        self._grep = {}
+
+    def grep(self, pattern, limit=200):
+        key = (pattern, limit)
+        if key not in self._grep:
+            self._grep[key] = [(p, t) for p, t in self.files if pattern in t][:limit]
+        return self._grep[key]
+
+    def kind(self, kind):
+        return self.kinds.get(kind, [])
+
+    def resources_of(self, *kinds):
+        return [r for r in self.resources if r.kind in kinds]
+
+@functools.lru_cache(maxsize=None)
+def manifest_index():
+    return ManifestIndex(repo_files())
+
 def grep_yaml(pattern, limit=200):
-    matches=[]
-    for p in ROOT.rglob("*.y*ml"):
-        # skip workflow files
-        if ".github/workflows" in str(p): continue
-        t = read_text(p)
-        if pattern in t:
-            matches.append((str(p), t))
-            if len(matches)>=limit: break
-    return matches
+    return manifest_index().grep(pattern, limit)
 
 def find_storageclasses():
-    names=set()
-    for _, t in grep_yaml("kind: StorageClass"):
-        names.update(re.findall(r"name:\s*([A-Za-z0-9-_.]+)", t))
-    return sorted(names)
+    return sorted({r.name for r in manifest_index().resources_of("StorageClass")})
 
 def find_metallb_pools():
     pools=[]
-    for _, t in grep_yaml("IPAddressPool"):
+    for _, t in manifest_index().kind("IPAddressPool"):
         if "metallb.io" not in t: continue
         m = re.search(r"addresses:\s*\[\s*([^\]]+)\s*\]", t)
         if m:
@@ -82,11 +145,7 @@ def find_metallb_pools():
     return uniq
 
 def find_k8s_workloads():
-    apps=set()
-    for _, t in grep_yaml("kind:"):
-        for kind, name in re.findall(r"kind:\s*(Deployment|StatefulSet|DaemonSet)\s*\n[\s\S]*?name:\s*([A-Za-z0-9-_.]+)", t):
-            apps.add(name.strip())
-    return sorted(apps)
+    return sorted({r.name for r in manifest_index().resources_of("Deployment", "StatefulSet", "DaemonSet")})
 
 def parse_inventory():
     paths = ["ansible/inventory/hosts","ansible/inventory.ini","ansible/hosts","ansible/inventory.yaml","ansible/inventory.yml"]
@@ -117,16 +176,12 @@ def readme_section(title):
     body = txt[start:start+nxt.start()] if nxt else txt[start:]
     return body.strip()
 
+@functools.lru_cache(maxsize=None)
+def memory_bank():
+    return MemoryBank(MB)
+
 def memory_bank_links(keywords, limit=30):
-    items=[]
-    if MB.exists():
-        for p in sorted(MB.glob("*.md")):
-            name=p.name.lower()
-            text=read_text(p)
-            if any(k in name for k in keywords) or any(k in text.lower() for k in keywords):
-                title = (text.splitlines()[0].strip("# ").strip() if text.startswith("#") else p.stem.replace("-", " "))
-                items.append((title, f"memory_bank/{p.name}"))
-    return items[:limit]
+    return memory_bank().links(keywords, limit)
 
 # ---------- builders ----------
 def build_home():
@@ -374,29 +429,75 @@ def build_apps():
         L.append("")
     write_text(WIKI/"09-Apps.md", "\n".join(L))
 
-def build_benchmarking():
-    # Very light log scan (fio/iperf/sysbench); include first 80 lines
-    items=[]
-    for p in ROOT.rglob("*"):
-        if p.suffix.lower() not in {".log",".txt",".md"}: continue
+BENCH_TOOLS = ("fio","iperf","sysbench","iozone","benchmark")
+
+def find_benchmark_logs(limit=20):
+    out=[]
+    for p in repo_files().suffix(".log", ".txt", ".md", ".json"):
+        # never feed generated pages (10-Benchmarking.md itself) back in
+        if p.parent == WIKI: continue
         nm=p.name.lower()
-        if any(k in nm for k in ("fio","iperf","sysbench","benchmark")):
-            text=read_text(p)
-            if text: items.append((str(p), text))
-        if len(items)>=20: break
+        if any(k in nm for k in BENCH_TOOLS):
+            out.append(p)
+            if len(out)>=limit: break
+    return out
+
+def fmt_num(v):
+    return f"{v:,.2f}".rstrip("0").rstrip(".")
+
+def find_adrs():
+    return [str(p) for p in repo_files().suffix(".md") if p.name.startswith("ADR-")]
+
+def build_benchmarking():
+    # Logs are parsed in one streaming pass each; raw excerpts (first 80 lines)
+    # only for files none of the fio/iperf/sysbench/iozone parsers understood.
+    by_tool={}; raw=[]
+    for p in find_benchmark_logs():
+        rows=parse_bench_log(p)
+        for r in rows: by_tool.setdefault(r.tool, []).append((str(p), r))
+        if not rows:
+            head=head_lines(p, 80)
+            if head: raw.append((str(p), head))
+
+    history=compare_bench_runs(load_bench_runs(ROOT/BENCH_STORE))
 
     L=[]
     L.append("# Benchmarking")
     L.append(f"*Generated — {now_utc()}*")
     L.append("")
-    if items:
-        for path, text in items:
-            L.append(f"### {path}\n")
-            L.append("```")
-            L.append("\n".join(text.splitlines()[:80]))
-            L.append("```\n")
-    else:
-        L.append("_No benchmark logs found in repo. Add fio/iperf/sysbench outputs to include them here._")
+    if history:
+        L.append("## Disk benchmark history\n")
+        L.append(f"_iozone MB/s per node and mount from `{BENCH_STORE}` (see `benchmarks/bench_store.py`)._\n")
+        L.append("| Node | Mount | Test | Latest | Previous | Δ | p10 / p50 / p90 | Runs |")
+        L.append("|---|---|---|---|---|---|---|---|")
+        for r in history:
+            prev=fmt_num(r["previous"]) if r["previous"] is not None else "-"
+            delta=f"{r['delta_pct']:+.1f}%" if r["delta_pct"] is not None else "-"
+            if r["regression"]: delta=f"**{delta} regression**"
+            spread=" / ".join(fmt_num(r[k]) for k in ("p10","p50","p90"))
+            L.append(f"| {r['node']} | {r['mount']} | {r['test']} | {fmt_num(r['latest'])} ({r['date']}) | {prev} | {delta} | {spread} | {r['runs']} |")
+        L.append("")
+    for tool, items in sorted(by_tool.items()):
+        metrics={}
+        table={}
+        for path, r in items:
+            metrics.setdefault(r.metric, r.unit)
+            table.setdefault((path, r.test), {})[r.metric]=r.value
+        cols=[f"{m} ({u})" if u else m for m, u in metrics.items()]
+        L.append(f"## {tool}\n")
+        L.append("| Source | Test | " + " | ".join(cols) + " |")
+        L.append("|---|---|" + "---|"*len(cols))
+        for (path, test), vals in table.items():
+            cells=[fmt_num(vals[m]) if m in vals else "-" for m in metrics]
+            L.append(f"| `{path}` | {test} | " + " | ".join(cells) + " |")
+        L.append("")
+    for path, head in raw:
+        L.append(f"### {path}\n")
+        L.append("```")
+        L.append("\n".join(head))
+        L.append("```\n")
+    if not history and not by_tool and not raw:
+        L.append("_No benchmark logs found in repo. Add fio/iperf/sysbench/iozone outputs to include them here._")
     write_text(WIKI/"10-Benchmarking.md", "\n".join(L))
 
 def build_runbooks():
@@ -428,9 +529,7 @@ def build_troubleshooting():
     write_text(WIKI/"12-Troubleshooting.md", "\n".join(L))
 
 def build_adr_index():
-    adrs=[]
-    for p in ROOT.rglob("ADR-*.md"):
-        adrs.append(str(p))
+    adrs=find_adrs()
     L=[]
     L.append("# ADR Index")
     L.append(f"*Generated — {now_utc()}*")
@@ -457,21 +556,8 @@ def build_images_index():
     write_text(WIKI/"Images-Index.md", "\n".join(L))
 
 def build_memory_bank_index():
-    rows=[]
-    for p in sorted(MB.glob("*.md")):
-        text=read_text(p)
-        title=(text.splitlines()[0].strip("# ").strip() if text.startswith("#") else p.stem.replace("-", " "))
-        m=re.match(r"(20\d{2}-\d{2}-\d{2})", p.name)
-        date=m.group(1) if m else "-"
-        tag_text=text.lower()
-        tags=[]
-        if any(k in tag_text for k in ["ceph","rbd","cephfs","osd","mds","storageclass","erasure"]): tags.append("Storage")
-        if any(k in tag_text for k in ["metallb","traefik","ingress","dns","pihole"]): tags.append("Networking")
-        if any(k in tag_text for k in ["argocd","helm","ansible","iac","gitops","cleanup","wipe"]): tags.append("GitOps/IaC")
-        if any(k in tag_text for k in ["cert","tls","ca","acme","keycloak","oauth2-proxy"]): tags.append("Security/Certs")
-        if any(k in tag_text for k in ["prometheus","grafana","alertmanager","observability"]): tags.append("Observability")
-        if any(k in tag_text for k in ["plex","n8n","openwebui","bedrock"]): tags.append("Apps")
-        rows.append((date, title, p.name, ", ".join(sorted(set(tags)) or ["Misc"])))
+    bank=memory_bank()
+    rows=[(n.date or "-", n.title, n.name, ", ".join(bank.tags(n))) for n in bank.notes]
     rows.sort(key=lambda r:(r[0], r[2]), reverse=True)
     L=[]
     L.append("# Memory Bank Index")
@@ -484,16 +570,8 @@ def build_memory_bank_index():
     write_text(WIKI/"14-Memory-Bank-Index.md", "\n".join(L))
 
 def summarize_memory_into_topics():
-    buckets={"Storage":[], "Networking":[], "GitOps/IaC":[], "Security/Certs":[], "Apps":[]}
-    for p in sorted(MB.glob("*.md")):
-        txt=read_text(p).lower()
-        title=(read_text(p).splitlines()[0].strip("# ").strip() if read_text(p).startswith("#") else p.stem.replace("-", " "))
-        rel=f"memory_bank/{p.name}"
-        if any(k in txt for k in ["ceph","rbd","cephfs","mds","erasure","storageclass"]): buckets["Storage"].append((title, rel))
-        if any(k in txt for k in ["metallb","traefik","ingress","dns","pihole"]): buckets["Networking"].append((title, rel))
-        if any(k in txt for k in ["argocd","helm","ansible","iac","gitops","cleanup","wipe"]): buckets["GitOps/IaC"].append((title, rel))
-        if any(k in txt for k in ["cert","tls","ca","acme","keycloak","oauth2-proxy"]): buckets["Security/Certs"].append((title, rel))
-        if any(k in txt for k in ["plex","n8n","openwebui","bedrock"]): buckets["Apps"].append((title, rel))
+    bank=memory_bank()
+    buckets={k: [(n.title, n.rel) for n in bank.topic(k, SUMMARY_TOPICS)] for k in SUMMARY_TOPICS}
     targets={
         "Storage": WIKI/"06-Storage-Rook-Ceph.md",
         "Networking": WIKI/"07-Networking-and-Ingress.md",
@@ -511,28 +589,197 @@ def summarize_memory_into_topics():
             md += f"- [{title}]({rel})\n"
         write_text(p, md)
 
-def main():
+# ---------- incremental builds ----------
+def sha256(data):
+    if isinstance(data, str): data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""): h.update(chunk)
+    except OSError:
+        pass
+    return h.hexdigest()
+
+def _digest_files(paths):
+    h = hashlib.sha256()
+    for p in paths:
+        h.update(str(p).encode("utf-8") + b"\0" + _file_sha256(p).encode("ascii"))
+    return h.hexdigest()
+
+@functools.lru_cache(maxsize=None)
+def input_digest(spec):
+    """Digest of one page input. `spec` is a tuple: (source, *args)."""
+    src, *args = spec
+    if src == "readme":
+        return sha256(readme_section(args[0]) if args else read_text("README.md"))
+    if src == "file":
+        return sha256(read_text(args[0]))
+    if src == "yaml":
+        return _digest_files(p for p, _ in grep_yaml(args[0]))
+    if src == "kind":
+        return _digest_files(p for k in args for p, _ in manifest_index().kind(k))
+    if src == "memory_bank":
+        return sha256("\0".join(f"{n.name}\0{sha256(n.text)}" for n in memory_bank().notes))
+    if src == "images":
+        return sha256("\n".join(sorted(p.name for p in IMAGES.glob("*")))) if IMAGES.exists() else ""
+    if src == "benchmarks":
+        return _digest_files(find_benchmark_logs())
+    if src == "adr":
+        return sha256("\n".join(find_adrs()))
+    raise ValueError(f"unknown page input: {spec}")
+
+WORKLOAD_KINDS = ("kind", "Deployment", "StatefulSet", "DaemonSet")
+
+# (page, builder, inputs). Inputs are input_digest() specs; a page is only
+# rebuilt in --incremental mode when one of them (or this script) changed.
+PAGES = [
+    ("Home.md", build_home, ()),
+    ("01-Overview.md", build_overview, (("readme",), ("images",))),
+    ("02-Architecture.md", build_architecture, (("readme", "Architecture"), ("images",), ("kind", "IPAddressPool"), ("kind", "StorageClass"), WORKLOAD_KINDS, ("memory_bank",))),
+    ("03-Hardware-and-Network.md", build_hardware, (("file", "ansible/inventory/hosts"), ("file", "ansible/inventory.ini"), ("file", "ansible/hosts"), ("file", "ansible/inventory.yaml"), ("file", "ansible/inventory.yml"), ("images",), ("memory_bank",))),
+    ("04-Bootstrap-and-Cold-Start.md", build_bootstrap, (("file", "ansible/group_vars/all/config.yml"), ("file", "ansible/group_vars/all/config.yaml"), ("memory_bank",))),
+    ("05-GitOps-and-IaC.md", build_gitops, (("yaml", "argoproj.io"), ("yaml", "apiVersion: v2"), ("yaml", "Chart.yaml"), ("file", "ansible/playbook.yml"), ("file", "ansible/site.yml"), ("memory_bank",))),
+    ("06-Storage-Rook-Ceph.md", build_storage, (("kind", "StorageClass"), ("yaml", "rook-ceph"), ("images",), ("memory_bank",))),
+    ("07-Networking-and-Ingress.md", build_networking, (("kind", "IPAddressPool"), ("yaml", "traefik"), ("images",), ("memory_bank",))),
+    ("08-Security-and-Certificates.md", build_security, (("memory_bank",),)),
+    ("09-Apps.md", build_apps, (WORKLOAD_KINDS, ("images",), ("memory_bank",))),
+    ("10-Benchmarking.md", build_benchmarking, (("benchmarks",), ("file", BENCH_STORE))),
+    ("11-Runbooks.md", build_runbooks, (("memory_bank",),)),
+    ("12-Troubleshooting.md", build_troubleshooting, (("memory_bank",),)),
+    ("13-ADR-Index.md", build_adr_index, (("adr",),)),
+    ("Images-Index.md", build_images_index, (("images",),)),
+    ("14-Memory-Bank-Index.md", build_memory_bank_index, (("memory_bank",),)),
+]
+
+# The generator's own code: this file plus the modules that parse and render
+# page inputs. A change to any of them invalidates every page.
+GENERATOR_MODULES = ("bench_logs", "k8s_resources", "memory_bank", "repo_walk", "bench_store")
+
+@functools.lru_cache(maxsize=None)
+def generator_digest():
+    paths = [__file__] + [sys.modules[name].__file__ for name in GENERATOR_MODULES]
+    return sha256("".join(sha256(read_text(p)) for p in paths))
+
+def page_key(inputs):
+    h = hashlib.sha256(generator_digest().encode("ascii"))
+    for spec in inputs:
+        h.update(repr(spec).encode("utf-8") + input_digest(spec).encode("ascii"))
+    return h.hexdigest()
+
+def load_build_manifest(path=BUILD_MANIFEST):
+    try:
+        return json.loads(read_text(path) or "{}").get("pages", {})
+    except ValueError:
+        return {}
+
+def save_build_manifest(pages, path=BUILD_MANIFEST):
+    write_text(path, json.dumps({"version": 1, "pages": pages}, indent=2, sort_keys=True) + "\n")
+
+# ---------- scheduling ----------
+# Pages summarize_memory_into_topics() post-edits; it must run after them.
+SUMMARY_PAGES = ("05-GitOps-and-IaC.md", "06-Storage-Rook-Ceph.md", "07-Networking-and-Ingress.md",
+                 "08-Security-and-Certificates.md", "09-Apps.md")
+
+def run_steps(steps, jobs=1):
+    """Run {name: (fn, deps)} on a pool of `jobs` threads.
+
+    Each step is submitted as soon as every step named in its deps has
+    finished; deps that are not in `steps` count as already done. The first
+    builder exception is re-raised once the pool drains.
+    """
+    pending = dict(steps)
+    done = {d for _, deps in steps.values() for d in deps if d not in steps}
+    running = {}
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while pending or running:
+            for name, (fn, deps) in list(pending.items()):
+                if all(d in done for d in deps):
+                    running[pool.submit(fn)] = name
+                    del pending[name]
+            if not running:
+                raise RuntimeError(f"unsatisfiable build step dependencies: {sorted(pending)}")
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for f in finished:
+                name = running.pop(f)
+                f.result()
+                done.add(name)
+
+# Scanners the --profile report breaks out of the merged profile.
+def profiled_scanners():
+    return {
+        "repo walk (RepoFiles)": RepoFiles.__init__,
+        "ManifestIndex load": ManifestIndex.__init__,
+        "iter_resources": iter_resources,
+        "grep_yaml": grep_yaml,
+        "MemoryBank load": MemoryBank.__init__,
+        "memory_bank_links": memory_bank_links,
+        "MemoryBank.hits": MemoryBank.hits,
+        "list_images": list_images,
+        "find_benchmark_logs": find_benchmark_logs,
+        "parse_bench_log": parse_bench_log,
+        "input_digest": input_digest,
+        "read_text": read_text,
+        "write_text": write_text,
+    }
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate the wiki pages under docs/wiki/.")
+    ap.add_argument("--incremental", action="store_true",
+                    help="skip pages whose inputs are unchanged since the last recorded build")
+    ap.add_argument("--manifest", type=pathlib.Path, default=BUILD_MANIFEST,
+                    help=f"build manifest of per-page input hashes (default: {BUILD_MANIFEST})")
+    ap.add_argument("--prune", action="append", default=[], metavar="PATH",
+                    help="extra repo-relative path to leave out of scans (repeatable)")
+    ap.add_argument("--jobs", "-j", type=int, default=min(8, os.cpu_count() or 1),
+                    help="number of builders to run concurrently (default: %(default)s)")
+    ap.add_argument("--profile", action="store_true",
+                    help="print wall time, file reads and regex time per builder")
+    ap.add_argument("--profile-out", type=pathlib.Path, metavar="FILE",
+                    help="with --profile: also write the merged cProfile stats (python -m pstats FILE)")
+    args = ap.parse_args(argv)
+
+    prof = Profiler() if args.profile or args.profile_out else None
+    if prof and not PROFILE_CONCURRENT and args.jobs > 1:
+        print(f"--profile on Python {sys.version_info.major}.{sys.version_info.minor}: "
+              f"one profiler per process, running builders with --jobs 1")
+        args.jobs = 1
+    step = prof.run if prof else (lambda name, fn: fn())
+    PRUNE.extend(args.prune)
     ensure_dirs()
-    # Core pages
-    build_home()
-    build_overview()
-    build_architecture()
-    build_hardware()
-    build_bootstrap()
-    build_gitops()
-    build_storage()
-    build_networking()
-    build_security()
-    build_apps()
-    build_benchmarking()
-    build_runbooks()
-    build_troubleshooting()
-    build_adr_index()
-    build_images_index()
-    # Memory bank indexes/backlinks
-    build_memory_bank_index()
-    summarize_memory_into_topics()
+    with prof.installed() if prof else contextlib.nullcontext():
+        previous = load_build_manifest(args.manifest) if args.incremental else {}
+        # Load the shared indexes up front so builder threads only ever read them
+        step("repo_files", repo_files); step("manifest_index", manifest_index); step("memory_bank", memory_bank)
+        pages = {}
+        steps = {}
+        # Core pages + memory bank index
+        for name, builder, inputs in PAGES:
+            key = step("page_key", lambda: page_key(inputs))
+            out = WIKI/name
+            prev = previous.get(name, {})
+            if not (prev.get("inputs") == key and out.exists() and prev.get("output") == sha256(read_text(out))):
+                steps[name] = (prof.wrap(builder.__name__, builder) if prof else builder, ())
+            pages[name] = {"inputs": key}
+        # Memory bank backlinks (post-edits pages 05-09; a no-op write when unchanged)
+        summarize = summarize_memory_into_topics
+        steps["summarize"] = (prof.wrap(summarize.__name__, summarize) if prof else summarize, SUMMARY_PAGES)
+        built, skipped = len(steps) - 1, len(PAGES) - len(steps) + 1
+        run_steps(steps, args.jobs)
+        for name in pages:
+            pages[name]["output"] = sha256(read_text(WIKI/name))
+        step("save_build_manifest", lambda: save_build_manifest(pages, args.manifest))
+    if args.incremental:
+        print(f"Rebuilt {built} page(s), {skipped} unchanged")
     print("All wiki pages generated under docs/wiki/")
+    if prof:
+        print()
+        print(prof.report(profiled_scanners()))
+        if args.profile_out:
+            prof.dump(args.profile_out)
+            print(f"cProfile stats written to {args.profile_out}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,183 @@
+"""
+Opt-in per-builder instrumentation for build_all.py (--profile).
+
+Profiler.run(name, fn) runs one build step and charges to it the wall
+time, the files opened for reading (and how many distinct ones), what was
+read from them and the time spent inside the `re` module. Steps run on
+builder threads, so attribution is per thread: whatever a step's thread
+opens or matches while the step runs belongs to it.
+
+- reads: open()/io.open() (and so pathlib's read_text) are hooked while
+  installed() is active; files opened for reading are wrapped so
+  read/readline/iteration add to the step's count - characters for text
+  mode, bytes for binary
+- regex: each step runs under its own cProfile.Profile (profiles are per
+  thread), and the regex time is the self-time of re.Pattern methods,
+  _sre and the re package's Python helpers. From Python 3.12 cProfile sits
+  on sys.monitoring and only one profiler may be active per process, so
+  CONCURRENT is False there and build_all.py runs the steps one at a time
+- scanners: report() looks up the cumulative time of the given scanner
+  functions (grep_yaml, memory_bank_links, the repo walk, ...) in the
+  merged profile, to show which one dominates the run
+
+cProfile roughly doubles the time of call-heavy code, so compare wall
+times between profiled runs only. dump() writes the merged profile as a
+pstats file for `python -m pstats` or snakeviz.
+"""
+
+import builtins, contextlib, cProfile, functools, inspect, io, os, pstats, sys, threading, time
+
+# Whether steps on different threads can be profiled at the same time
+CONCURRENT = sys.version_info < (3, 12)
+
+class Step:
+    __slots__ = ("name", "calls", "wall", "opens", "paths", "read", "regex")
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = self.opens = self.read = 0
+        self.wall = self.regex = 0.0
+        self.paths = set()
+
+class _Counted:
+    """File object proxy that adds what is read through it to a Step."""
+
+    def __init__(self, f, step):
+        self._f, self._step = f, step
+
+    def read(self, *args):
+        data = self._f.read(*args)
+        self._step.read += len(data)
+        return data
+
+    def readline(self, *args):
+        line = self._f.readline(*args)
+        self._step.read += len(line)
+        return line
+
+    def readlines(self, *args):
+        lines = self._f.readlines(*args)
+        self._step.read += sum(len(l) for l in lines)
+        return lines
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = next(self._f)
+        self._step.read += len(line)
+        return line
+
+    def __enter__(self):
+        self._f.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._f.__exit__(*exc)
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+def _is_regex(key):
+    filename, _, func = key
+    if filename == "~":
+        return "re.Pattern" in func or "_sre" in func
+    return os.sep + "re" + os.sep in filename or filename.endswith(os.sep + "re.py")
+
+def regex_seconds(stats):
+    """Self-time spent in the regex engine, from a pstats.Stats."""
+    return sum(tt for key, (_, _, tt, _, _) in stats.stats.items() if _is_regex(key))
+
+def _code_key(fn):
+    code = inspect.unwrap(fn).__code__
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+class Profiler:
+    def __init__(self):
+        self.steps = {}        # name -> Step, in first-run order
+        self._profiles = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def installed(self):
+        """Hook open() for the duration of the build."""
+        real = io.open
+        def hooked_open(file, mode="r", *args, **kwargs):
+            f = real(file, mode, *args, **kwargs)
+            step = getattr(self._local, "step", None)
+            if step is None or any(c in mode for c in "wax+"):
+                return f
+            step.opens += 1
+            step.paths.add(file if isinstance(file, int) else os.fspath(file))
+            return _Counted(f, step)
+        io.open = builtins.open = hooked_open
+        try:
+            yield self
+        finally:
+            io.open = builtins.open = real
+
+    def run(self, name, fn):
+        """Call fn() as step `name`, on the current thread."""
+        with self._lock:
+            step = self.steps.setdefault(name, Step(name))
+        outer = getattr(self._local, "step", None)
+        # one profiler per thread at a time: a nested step is timed but not profiled
+        prof = cProfile.Profile() if outer is None else None
+        self._local.step = step
+        t0 = time.perf_counter()
+        if prof: prof.enable()
+        try:
+            return fn()
+        finally:
+            if prof: prof.disable()
+            step.wall += time.perf_counter() - t0
+            step.calls += 1
+            self._local.step = outer
+            if prof:
+                step.regex += regex_seconds(pstats.Stats(prof))
+                with self._lock:
+                    self._profiles.append(prof)
+
+    def wrap(self, name, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return self.run(name, lambda: fn(*args, **kwargs))
+        return wrapper
+
+    def stats(self):
+        """All step profiles merged into one pstats.Stats (None before any step ran)."""
+        if not self._profiles:
+            return None
+        merged = pstats.Stats(self._profiles[0])
+        for prof in self._profiles[1:]:
+            merged.add(prof)
+        return merged
+
+    def dump(self, path):
+        stats = self.stats()
+        if stats:
+            stats.dump_stats(str(path))
+
+    def report(self, scanners=None):
+        """Per-step table sorted by wall time, then the scanner breakdown."""
+        L = [f"{'step':<32} {'wall s':>8} {'files':>6} {'distinct':>8} {'read KiB':>9} {'regex s':>8}"]
+        for s in sorted(self.steps.values(), key=lambda s: s.wall, reverse=True):
+            L.append(f"{s.name:<32} {s.wall:>8.3f} {s.opens:>6} {len(s.paths):>8} {s.read / 1024:>9.1f} {s.regex:>8.3f}")
+        total = sum(s.wall for s in self.steps.values())
+        L.append(f"{'sum':<32} {total:>8.3f} {sum(s.opens for s in self.steps.values()):>6} {'':>8} "
+                 f"{sum(s.read for s in self.steps.values()) / 1024:>9.1f} {sum(s.regex for s in self.steps.values()):>8.3f}")
+        stats = self.stats() if scanners else None
+        if stats:
+            rows = []
+            for label, fn in scanners.items():
+                entry = stats.stats.get(_code_key(fn))
+                if entry:
+                    _, calls, _, cum, _ = entry
+                    rows.append((cum, label, calls))
+            if rows:
+                L.append("")
+                L.append(f"{'scanner':<32} {'cum s':>8} {'calls':>6}")
+                for cum, label, calls in sorted(rows, reverse=True):
+                    L.append(f"{label:<32} {cum:>8.3f} {calls:>6}")
+        return "\n".join(L)
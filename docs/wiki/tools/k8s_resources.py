@@ -0,0 +1,128 @@
+"""
+Streaming Kubernetes resource extractor for the wiki tools.
+
+Walks YAML line by line (no PyYAML needed) and yields one Resource per
+mapping that carries `apiVersion`, `kind` and `metadata.name` - top-level
+documents in a `---` stream as well as manifests nested in lists or
+Ansible `definition:` blocks. Rook's Helm-values convention
+(`storageClass: {enabled: true, name: ...}`) is reported as a StorageClass
+too, since that is how this repo defines most of them. Block scalars (`|`, `>`) are skipped, so
+scripts and embedded YAML inside ConfigMaps are not mistaken for
+resources.
+
+Each line is looked at once and only the stack of currently open mappings
+is kept, so time is linear and memory is bounded by nesting depth even on
+multi-megabyte Helm values files.
+
+Usage:
+  python docs/wiki/tools/k8s_resources.py deployments/**/*.yaml
+"""
+
+import collections, re, sys
+
+Resource = collections.namedtuple("Resource", "kind name namespace path")
+
+KEY_RE = re.compile(r"""^(?P<key>[A-Za-z0-9_.\-/"']+)\s*:(?:\s+(?P<value>.*))?$""")
+BLOCK_SCALAR_RE = re.compile(r"^[|>][-+0-9]*\s*(#.*)?$")
+FLOW_META_RE = re.compile(r"\b(name|namespace)\s*:\s*([^,}]+)")
+
+def _scalar(value):
+    value = (value or "").strip()
+    if value[:1] in ("'", '"'):
+        return value[1:value.find(value[0], 1)] if value.find(value[0], 1) > 0 else value[1:]
+    return value.split(" #", 1)[0].strip()
+
+class _Frame:
+    __slots__ = ("indent", "parent_key", "last_key", "api_version", "kind", "name", "namespace",
+                 "meta_indent", "plain_name", "enabled")
+
+    def __init__(self, indent, parent_key=None):
+        self.indent = indent
+        self.parent_key = parent_key   # key this mapping is the value of
+        self.last_key = None
+        self.api_version = self.kind = self.name = self.namespace = None
+        self.meta_indent = None   # indent of metadata's children, once inside it
+        self.plain_name = self.enabled = None
+
+    def resource(self, path):
+        if self.api_version and self.kind and self.name and "{{" not in self.name:
+            return Resource(self.kind, self.name, self.namespace or "", str(path))
+        if self.parent_key == "storageClass" and self.plain_name and self.enabled != "false":
+            return Resource("StorageClass", self.plain_name, "", str(path))
+
+def iter_resources(lines, path="-"):
+    """Yield Resource records from an iterable of YAML lines."""
+    stack = []          # open mappings, innermost last
+    meta = None         # (frame, indent of the metadata: key) while inside metadata
+    block = None        # indent of a key whose block scalar we are skipping
+
+    def close(indent):
+        nonlocal meta
+        while stack and stack[-1].indent >= indent:
+            f = stack.pop()
+            if meta and meta[0] is f: meta = None
+            r = f.resource(path)
+            if r: yield r
+
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        stripped = line.strip()
+        if stripped in ("---", "...") or stripped.startswith("--- "):
+            yield from close(0); block = None
+            continue
+        if not stripped or stripped.startswith("#"):
+            continue
+        indent = len(line) - len(line.lstrip(" "))
+        if block is not None:
+            if indent > block: continue
+            block = None
+        if meta and indent <= meta[1]:
+            meta = None
+        body = line[indent:]
+        # "- key: value" opens a new mapping at the column after the dash
+        while body.startswith("- "):
+            yield from close(indent)
+            body = body[2:].lstrip(" ")
+            indent = len(line) - len(body)
+            stack.append(_Frame(indent, stack[-1].last_key if stack else None))
+        m = KEY_RE.match(body)
+        if not m:
+            continue
+        key, value = m.group("key").strip("'\""), m.group("value")
+        if value and BLOCK_SCALAR_RE.match(value.strip()):
+            block = indent
+        if meta:
+            f = meta[0]
+            if f.meta_indent is None: f.meta_indent = indent
+            if indent == f.meta_indent:
+                if key == "name" and f.name is None: f.name = _scalar(value) or None
+                elif key == "namespace" and f.namespace is None: f.namespace = _scalar(value) or None
+            continue
+        yield from close(indent + 1)
+        if not stack or stack[-1].indent != indent:
+            stack.append(_Frame(indent, stack[-1].last_key if stack else None))
+        f = stack[-1]
+        f.last_key = key
+        if key == "apiVersion": f.api_version = _scalar(value)
+        elif key == "kind": f.kind = _scalar(value)
+        elif key == "metadata" and not value: meta = (f, indent)
+        elif key == "metadata" and value.startswith("{"):
+            for k, v in FLOW_META_RE.findall(value):
+                if k == "name": f.name = _scalar(v)
+                else: f.namespace = _scalar(v)
+        elif key == "name": f.plain_name = _scalar(value)
+        elif key == "enabled": f.enabled = _scalar(value).lower()
+    yield from close(0)
+
+def scan_file(path):
+    """Stream one file from disk; never holds more than one line in memory."""
+    try:
+        with open(path, encoding="utf-8", errors="ignore") as fh:
+            yield from iter_resources(fh, path)
+    except OSError:
+        return
+
+if __name__ == "__main__":
+    for p in sys.argv[1:]:
+        for r in scan_file(p):
+            print(f"{r.path}\t{r.kind}\t{r.namespace or '-'}\t{r.name}")
@@ -0,0 +1,119 @@
+"""
+Memory-bank corpus shared by the wiki tools.
+
+Loads docs/wiki/memory_bank/*.md once and builds a tokenized inverted index
+(token -> notes), with each note's title and date precomputed. Builders ask
+for notes by keyword instead of re-reading and lower-casing every file per
+keyword, so the cost is one pass over the corpus per run.
+
+Keyword semantics match the old substring tests: a keyword hits a note when
+it occurs inside any token of the note's text or, for page links, of its
+file name; topic tags look at the text only, as the old taggers did.
+Multi-word keywords ("cold start") are checked as phrases against the
+candidate notes.
+
+Used by build_all.py, build_memory_bank_index.py and
+summarize_memory_bank_into_topics.py.
+"""
+
+import pathlib, re
+
+MB = pathlib.Path("docs/wiki/memory_bank")
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-_.][a-z0-9]+)*")
+
+# Topic tags for the Memory Bank Index.
+TOPICS = {
+    "Storage": ["ceph","rbd","cephfs","osd","mds","storageclass","erasure"],
+    "Networking": ["metallb","traefik","ingress","dns","pihole"],
+    "GitOps/IaC": ["argocd","helm","ansible","iac","gitops","cleanup","wipe"],
+    "Security/Certs": ["cert","tls","ca","acme","keycloak","oauth2-proxy"],
+    "Observability": ["prometheus","grafana","alertmanager","observability"],
+    "Apps": ["plex","n8n","openwebui","bedrock"],
+}
+
+# Buckets for the "From the Memory Bank" backlinks (summarize_*); Storage has
+# never matched "osd" here, unlike the index tags.
+SUMMARY_TOPICS = {
+    "Storage": ["ceph","rbd","cephfs","mds","erasure","storageclass"],
+    "Networking": TOPICS["Networking"],
+    "GitOps/IaC": TOPICS["GitOps/IaC"],
+    "Security/Certs": TOPICS["Security/Certs"],
+    "Apps": TOPICS["Apps"],
+}
+
+class Note:
+    __slots__ = ("pos", "name", "path", "rel", "title", "date", "text", "lower")
+
+    def __init__(self, pos, path, text):
+        self.pos = pos
+        self.path = path
+        self.name = path.name
+        self.rel = f"memory_bank/{path.name}"
+        self.text = text
+        self.lower = text.lower()
+        self.title = text.splitlines()[0].strip("# ").strip() if text.startswith("#") else path.stem.replace("-", " ")
+        m = re.match(r"(20\d{2}-\d{2}-\d{2})", path.name)
+        self.date = m.group(1) if m else ""
+
+class MemoryBank:
+    def __init__(self, root=MB):
+        self.notes = []       # sorted by file name
+        self.index = {}       # token -> set of note positions, from the text
+        self.name_index = {}  # the same from the file names
+        if root.exists():
+            for i, p in enumerate(sorted(root.glob("*.md"))):
+                self.notes.append(Note(i, p, p.read_text(encoding="utf-8", errors="ignore")))
+        for i, n in enumerate(self.notes):
+            for tok in set(TOKEN_RE.findall(n.lower)):
+                self.index.setdefault(tok, set()).add(i)
+            for tok in set(TOKEN_RE.findall(n.name.lower())):
+                self.name_index.setdefault(tok, set()).add(i)
+        self._hits = {}
+        self._topics = {}
+
+    def hits(self, keyword, names=True):
+        """Positions of the notes whose text (or, with `names`, file name) contains `keyword`."""
+        k = keyword.lower()
+        if (k, names) not in self._hits:
+            words = TOKEN_RE.findall(k)
+            indexes = (self.index, self.name_index) if names else (self.index,)
+            found = set()
+            if words:
+                # notes holding every word somewhere, via the vocabulary
+                for j, w in enumerate(words):
+                    w_hits = set()
+                    for index in indexes:
+                        for tok, ids in index.items():
+                            if w in tok: w_hits |= ids
+                    found = w_hits if j == 0 else found & w_hits
+                if len(words) > 1 or words[0] != k:
+                    found = {i for i in found if k in self.notes[i].lower or names and k in self.notes[i].name.lower()}
+            self._hits[k, names] = found
+        return self._hits[k, names]
+
+    def matching(self, keywords):
+        """Notes matching any keyword, in file-name order."""
+        ids = set()
+        for k in keywords: ids |= self.hits(k)
+        return [self.notes[i] for i in sorted(ids)]
+
+    def links(self, keywords, limit=30):
+        return [(n.title, n.rel) for n in self.matching(keywords)][:limit]
+
+    def topic(self, name, topics=TOPICS):
+        """Notes tagged with topics[name], in file-name order."""
+        return [self.notes[i] for i in sorted(self._topic_ids(name, topics))]
+
+    def in_topic(self, note, name, topics=TOPICS):
+        return note.pos in self._topic_ids(name, topics)
+
+    def tags(self, note):
+        return sorted(t for t in TOPICS if self.in_topic(note, t)) or ["Misc"]
+
+    def _topic_ids(self, name, topics):
+        keywords = tuple(topics[name])
+        if keywords not in self._topics:
+            ids = set()
+            for k in keywords: ids |= self.hits(k, names=False)
+            self._topics[keywords] = ids
+        return self._topics[keywords]
@@ -0,0 +1,73 @@
+"""
+Pruned, .gitignore-aware repo walker shared by the wiki tools.
+
+One os.walk over the checkout that never descends into the prune list
+(VCS metadata, the vendored Ansible collection, binary asset trees) or
+into anything the root .gitignore excludes, and files every remaining
+path into a suffix bucket. Scanners then pick their bucket instead of
+each running its own ROOT.rglob() over the whole tree.
+
+Only the common .gitignore forms are understood: comments, `dir/`,
+`/anchored`, globs, and `**/`. Negations (`!pattern`) are ignored.
+"""
+
+import fnmatch, os, pathlib
+
+# Paths (relative to the repo root, POSIX style) that are never scanned.
+PRUNE = [
+    ".git",
+    ".cache",
+    "ansible/ansible_collections",
+    "assets",
+    "docs/wiki/images",
+]
+
+def gitignore_rules(root):
+    rules=[]
+    try:
+        lines = (pathlib.Path(root) / ".gitignore").read_text(encoding="utf-8", errors="ignore").splitlines()
+    except OSError:
+        return rules
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#") or line.startswith("!"): continue
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if line.startswith("**/"): line = line[3:]
+        anchored = "/" in line
+        rules.append((line.lstrip("/"), anchored, dir_only))
+    return rules
+
+def ignored(rel, is_dir, rules):
+    name = rel.rsplit("/", 1)[-1]
+    for pat, anchored, dir_only in rules:
+        if dir_only and not is_dir: continue
+        if fnmatch.fnmatchcase(rel if anchored else name, pat): return True
+    return False
+
+class RepoFiles:
+    """Every relevant file under `root`, from a single pruned walk."""
+
+    def __init__(self, root=".", prune=PRUNE, use_gitignore=True):
+        self.root = pathlib.Path(root)
+        self.files = []        # [Path] sorted by path
+        self.by_suffix = {}    # ".yaml" -> [Path]
+        pruned = {p.strip("/") for p in prune}
+        rules = gitignore_rules(root) if use_gitignore else []
+        for dirpath, dirnames, filenames in os.walk(root):
+            rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+            rel_dir = "" if rel_dir == "." else rel_dir + "/"
+            dirnames[:] = sorted(d for d in dirnames
+                                 if rel_dir + d not in pruned and not ignored(rel_dir + d, True, rules))
+            for f in sorted(filenames):
+                if rel_dir + f in pruned or ignored(rel_dir + f, False, rules): continue
+                self.files.append(self.root / (rel_dir + f))
+        self.files.sort()
+        for p in self.files:
+            self.by_suffix.setdefault(p.suffix.lower(), []).append(p)
+
+    def suffix(self, *suffixes):
+        """Files with any of the given suffixes (".yaml", ".yml", ...), in path order."""
+        if len(suffixes) == 1:
+            return self.by_suffix.get(suffixes[0], [])
+        return sorted(p for s in suffixes for p in self.by_suffix.get(s, []))